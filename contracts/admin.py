@@ -2,13 +2,80 @@
 Django Admin configuration for Contract Management module.
 """
 
+import csv
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+
 from .models import (
     Department, ContractType, Tag, Contract, ContractFile,
     ContractVersion, ContractTag, ContractShare, AdditionalApproval,
     Clause, ClausePlaybookEntry, Deviation, RiskItem,
     SignatureRecord, AuditLog
 )
+from .choice_cache import department_choices, contract_type_choices
+from .services import CONTRACT_SEARCH_VECTOR, contract_search_query
+
+
+class FasterAdminPaginator(Paginator):
+    """
+    Paginator for large changelists.
+
+    On PostgreSQL an unfiltered changelist uses the planner's row estimate
+    from pg_class instead of running COUNT(*) over the whole table. Filtered
+    querysets, other backends and never-analyzed tables fall back to an
+    exact count.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            connection = connections[self.object_list.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                        [query.model._meta.db_table]
+                    )
+                    row = cursor.fetchone()
+                if row and row[0] > 0:
+                    return row[0]
+        return super().count
+
+
+class DepartmentListFilter(admin.SimpleListFilter):
+    """BU/Team filter backed by a cached department list"""
+    title = 'BU / Team'
+    parameter_name = 'bu_team__id__exact'
+
+    def lookups(self, request, model_admin):
+        return department_choices()
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(bu_team_id=self.value())
+        return queryset
+
+
+class ContractTypeListFilter(admin.SimpleListFilter):
+    """Contract type filter backed by a cached contract type list"""
+    title = 'contract type'
+    parameter_name = 'contract_type__id__exact'
+
+    def lookups(self, request, model_admin):
+        return contract_type_choices()
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(contract_type_id=self.value())
+        return queryset
 
 
 @admin.register(Department)
@@ -55,14 +122,30 @@ class AdditionalApprovalInline(admin.TabularInline):
     readonly_fields = ['created_at']
 
 
+def _child_count(model):
+    """Number of model rows pointing at the outer contract"""
+    counts = model.objects.filter(contract=OuterRef('pk')).order_by().values('contract').annotate(
+        count=Count('pk')
+    ).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
 @admin.register(Contract)
 class ContractAdmin(admin.ModelAdmin):
     list_display = [
         'contract_number', 'title', 'status', 'category',
-        'customer_or_vendor_name', 'owner', 'created_at'
+        'customer_or_vendor_name', 'owner', 'file_count', 'version_count',
+        'approval_count', 'created_at'
+    ]
+    list_filter = [
+        'status', 'category', DepartmentListFilter, ContractTypeListFilter, 'is_confidential'
     ]
-    list_filter = ['status', 'category', 'bu_team', 'contract_type', 'is_confidential']
+    list_select_related = ['owner']
+    paginator = FasterAdminPaginator
+    show_full_result_count = False
     search_fields = ['contract_number', 'title', 'customer_or_vendor_name']
+    search_vector = CONTRACT_SEARCH_VECTOR
+    autocomplete_fields = ['owner']
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
     
@@ -95,11 +178,45 @@ class ContractAdmin(admin.ModelAdmin):
     
     inlines = [ContractFileInline, ContractVersionInline, AdditionalApprovalInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        # Full-text search on PostgreSQL uses the GIN index; elsewhere fall
+        # back to the icontains lookups from search_fields
+        if not search_term or connections[queryset.db].vendor != 'postgresql':
+            return super().get_search_results(request, queryset, search_term)
+        
+        query = contract_search_query(search_term)
+        return queryset.alias(search=self.search_vector).filter(search=query), False
+    
+    def get_queryset(self, request):
+        # One correlated COUNT per relation instead of joining all three,
+        # which would multiply the rows before grouping
+        return super().get_queryset(request).annotate(
+            _file_count=_child_count(ContractFile),
+            _version_count=_child_count(ContractVersion),
+            _approval_count=_child_count(AdditionalApproval),
+        )
+
+    @admin.display(description='Files', ordering='_file_count')
+    def file_count(self, obj):
+        return obj._file_count
+
+    @admin.display(description='Versions', ordering='_version_count')
+    def version_count(self, obj):
+        return obj._version_count
+
+    @admin.display(description='Approvals', ordering='_approval_count')
+    def approval_count(self, obj):
+        return obj._approval_count
+
 
 @admin.register(ContractFile)
 class ContractFileAdmin(admin.ModelAdmin):
     list_display = ['original_filename', 'contract', 'is_primary', 'uploaded_by', 'uploaded_at']
+    list_select_related = ['contract', 'uploaded_by']
+    paginator = FasterAdminPaginator
+    show_full_result_count = False
     list_filter = ['is_primary']
+    raw_id_fields = ['contract']
     search_fields = ['original_filename', 'contract__title']
     date_hierarchy = 'uploaded_at'
 
@@ -107,13 +224,16 @@ class ContractFileAdmin(admin.ModelAdmin):
 @admin.register(ContractVersion)
 class ContractVersionAdmin(admin.ModelAdmin):
     list_display = ['contract', 'version_number', 'label', 'created_by', 'created_at']
+    list_select_related = ['contract', 'created_by']
     search_fields = ['contract__title', 'label']
+    raw_id_fields = ['contract']
     date_hierarchy = 'created_at'
 
 
 @admin.register(ContractShare)
 class ContractShareAdmin(admin.ModelAdmin):
     list_display = ['contract', 'shared_with_user', 'shared_with_department', 'access_level', 'shared_at']
+    list_select_related = ['contract', 'shared_with_user', 'shared_with_department']
     list_filter = ['access_level']
     search_fields = ['contract__title']
 
@@ -121,6 +241,7 @@ class ContractShareAdmin(admin.ModelAdmin):
 @admin.register(AdditionalApproval)
 class AdditionalApprovalAdmin(admin.ModelAdmin):
     list_display = ['contract', 'requested_by', 'approver', 'status', 'created_at', 'decided_at']
+    list_select_related = ['contract', 'requested_by', 'approver']
     list_filter = ['status']
     search_fields = ['contract__title', 'requested_by__username', 'approver__username']
     date_hierarchy = 'created_at'
@@ -129,7 +250,10 @@ class AdditionalApprovalAdmin(admin.ModelAdmin):
 @admin.register(Clause)
 class ClauseAdmin(admin.ModelAdmin):
     list_display = ['label', 'contract', 'risk_level', 'is_from_playbook', 'created_at']
+    list_select_related = ['contract']
     list_filter = ['risk_level', 'is_from_playbook']
+    paginator = FasterAdminPaginator
+    show_full_result_count = False
     search_fields = ['label', 'text', 'contract__title']
 
 
@@ -143,6 +267,7 @@ class ClausePlaybookEntryAdmin(admin.ModelAdmin):
 @admin.register(Deviation)
 class DeviationAdmin(admin.ModelAdmin):
     list_display = ['contract', 'risk_level', 'approved', 'created_by', 'created_at']
+    list_select_related = ['contract', 'created_by']
     list_filter = ['risk_level', 'approved']
     search_fields = ['description', 'contract__title']
 
@@ -150,6 +275,7 @@ class DeviationAdmin(admin.ModelAdmin):
 @admin.register(RiskItem)
 class RiskItemAdmin(admin.ModelAdmin):
     list_display = ['contract', 'severity', 'status', 'created_by', 'created_at']
+    list_select_related = ['contract', 'created_by']
     list_filter = ['severity', 'status']
     search_fields = ['description', 'contract__title']
 
@@ -157,17 +283,61 @@ class RiskItemAdmin(admin.ModelAdmin):
 @admin.register(SignatureRecord)
 class SignatureRecordAdmin(admin.ModelAdmin):
     list_display = ['contract', 'party', 'signatory_name', 'sign_type', 'signed_at']
+    list_select_related = ['contract']
     list_filter = ['party', 'sign_type']
     search_fields = ['signatory_name', 'signatory_email', 'contract__title']
 
 
+class _EchoBuffer:
+    """File-like object for csv.writer that hands each row straight back"""
+
+    def write(self, value):
+        return value
+
+
+class AuditLogChangeList(ChangeList):
+    """
+    Audit log changelist that loads only the displayed columns, leaving the
+    metadata JSON and user agent for the change view.
+    """
+
+    def get_queryset(self, request, *args, **kwargs):
+        return super().get_queryset(request, *args, **kwargs).only(
+            'id', 'action', 'created_at',
+            'contract__id', 'contract__contract_number', 'contract__title',
+            'actor__id', 'actor__username',
+        )
+
+
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
     list_display = ['contract', 'action', 'actor', 'created_at']
+    list_select_related = ['contract', 'actor']
+    paginator = FasterAdminPaginator
+    show_full_result_count = False
     list_filter = ['action']
     search_fields = ['contract__title', 'actor__username']
     date_hierarchy = 'created_at'
     readonly_fields = ['contract', 'action', 'actor', 'metadata', 'ip_address', 'user_agent', 'created_at']
+    actions = ['export_csv']
+    
+    def get_changelist(self, request, **kwargs):
+        return AuditLogChangeList
+    
+    @admin.action(description='Export selected entries as CSV')
+    def export_csv(self, request, queryset):
+        action_labels = dict(AuditLog.Action.choices)
+        writer = csv.writer(_EchoBuffer())
+        
+        def rows():
+            yield writer.writerow(AuditLog.EXPORT_FIELDS)
+            for entry in AuditLog.export_iter(pk__in=queryset.values('pk')):
+                entry['action'] = action_labels.get(entry['action'], entry['action'])
+                yield writer.writerow([entry[field] for field in AuditLog.EXPORT_FIELDS])
+        
+        response = StreamingHttpResponse(rows(), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="audit_log.csv"'
+        return response
     
     def has_add_permission(self, request):
         return False
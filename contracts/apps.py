@@ -7,6 +7,5 @@ class ContractsConfig(AppConfig):
     verbose_name = 'Contract Management'
 
     def ready(self):
-        # Import signals if needed
-        pass
+        from . import signals  # noqa: F401
 
@@ -3,10 +3,21 @@ Pulse AI Assistant - Chatbot Backend
 Uses Google Gemini API for conversational AI
 """
 
+import hashlib
 import json
+import logging
+import math
 import os
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from django.http import JsonResponse
+import orjson
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 
@@ -18,6 +29,13 @@ try:
 except ImportError:
     pass  # python-dotenv not installed, rely on system env vars
 
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None  # google-generativeai not installed, fallback responses only
+
+logger = logging.getLogger(__name__)
+
 # System prompt that gives the AI context about the platform
 SYSTEM_PROMPT = """You are Pulse Assistant, an AI helper for the Pulse Contract Management platform. 
 You help users navigate the platform, answer questions about contracts, and provide guidance.
@@ -84,15 +102,154 @@ From a contract detail page, users can:
 Remember: You're helping users be more productive with the platform. Be encouraging and supportive!"""
 
 
-def get_gemini_response(user_message, chat_history):
+@lru_cache(maxsize=1)
+def _get_gemini_model(api_key):
+    """
+    Configure the SDK and build the Gemini model once per API key.
+    The system prompt is sent as the model's system instruction.
+    """
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel('gemini-1.5-flash', system_instruction=SYSTEM_PROMPT)
+
+
+def _get_api_key():
+    return os.environ.get('GEMINI_API_KEY') or os.environ.get('GOOGLE_API_KEY')
+
+
+# Semantic response cache for first-turn questions. Exact repeats are served
+# from the Django cache; paraphrases are matched by embedding similarity
+# against a bounded in-process store.
+SEMANTIC_CACHE_EMBED_MODEL = 'models/text-embedding-004'
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_MAX_ENTRIES = 500
+SEMANTIC_CACHE_TTL = 60 * 60  # seconds
+
+_semantic_cache_lock = threading.Lock()
+_semantic_cache = deque(maxlen=SEMANTIC_CACHE_MAX_ENTRIES)  # (expires_at, unit embedding, response)
+
+
+def _normalize_message(message):
+    return ' '.join(message.lower().split())
+
+
+def _exact_cache_key(message):
+    digest = hashlib.sha256(_normalize_message(message).encode('utf-8')).hexdigest()
+    return f'chatbot:response:{digest}'
+
+
+def _embed_message(message):
+    """Get a unit-length embedding for a message, or None if unavailable"""
+    api_key = _get_api_key()
+    if genai is None or not api_key:
+        return None
+    try:
+        _get_gemini_model(api_key)  # ensures the SDK is configured
+        result = genai.embed_content(model=SEMANTIC_CACHE_EMBED_MODEL, content=message)
+    except Exception:
+        logger.exception("Gemini embedding error")
+        return None
+    embedding = result['embedding']
+    norm = math.sqrt(sum(x * x for x in embedding))
+    if not norm:
+        return None
+    return [x / norm for x in embedding]
+
+
+def _semantic_lookup(user_message):
+    """
+    Embed a message and find the closest unexpired cached response.
+    Blocking and CPU-bound, so callers run it in a worker thread.
+    """
+    embedding = _embed_message(user_message)
+    if embedding is None:
+        return None, None
+    
+    now = time.monotonic()
+    best_score, best_response = 0.0, None
+    with _semantic_cache_lock:
+        entries = list(_semantic_cache)
+    for expires_at, cached_embedding, cached_response in entries:
+        if expires_at < now:
+            continue
+        score = sum(a * b for a, b in zip(embedding, cached_embedding))
+        if score > best_score:
+            best_score, best_response = score, cached_response
+    
+    if best_score >= SEMANTIC_CACHE_THRESHOLD:
+        return best_response, embedding
+    return None, embedding
+
+
+async def lookup_cached_response(user_message):
+    """
+    Find a cached response for a message or a semantically equivalent one.
+    Returns (response, embedding); the embedding is reused when storing a
+    fresh response so the message is only embedded once.
+    """
+    response = await cache.aget(_exact_cache_key(user_message))
+    if response is not None:
+        return response, None
+    
+    return await sync_to_async(_semantic_lookup, thread_sensitive=False)(user_message)
+
+
+async def store_cached_response(user_message, response, embedding=None):
+    """Cache a response for exact and semantic lookups"""
+    await cache.aset(_exact_cache_key(user_message), response, SEMANTIC_CACHE_TTL)
+    if embedding is not None:
+        with _semantic_cache_lock:
+            _semantic_cache.append((time.monotonic() + SEMANTIC_CACHE_TTL, embedding, response))
+
+
+# Widget message roles mapped to Gemini content roles. The system prompt is
+# sent once per model as system_instruction, so history holds only real turns.
+_GEMINI_ROLES = {'user': 'user', 'assistant': 'model'}
+
+CHAT_HISTORY_TURNS = 6
+CHAT_MESSAGE_MAX_CHARS = 2000
+
+
+def _trim_history(history):
+    """
+    Keep only the recent, well-formed turns of client-supplied history
+    """
+    if not isinstance(history, list):
+        return []
+    return [
+        {'role': msg['role'], 'content': str(msg.get('content', ''))[:CHAT_MESSAGE_MAX_CHARS]}
+        for msg in history[-CHAT_HISTORY_TURNS:]
+        if isinstance(msg, dict) and msg.get('role') in _GEMINI_ROLES
+    ]
+
+
+def _start_chat(api_key, chat_history):
+    """
+    Open a Gemini chat session seeded with the recent conversation
+    """
+    model = _get_gemini_model(api_key)
+    
+    # History has already been through _trim_history
+    conversation = [
+        {"role": _GEMINI_ROLES[msg['role']], "parts": [msg['content']]}
+        for msg in chat_history
+    ]
+    
+    return model.start_chat(history=conversation)
+
+
+async def get_gemini_response(user_message, chat_history):
     """
     Get response from Google Gemini API
     """
+    if genai is None:
+        return {
+            'success': False,
+            'response': "The AI module is not installed. Please run: pip install google-generativeai"
+        }
+    
     try:
-        import google.generativeai as genai
-        
         # Configure API key
-        api_key = os.environ.get('GEMINI_API_KEY') or os.environ.get('GOOGLE_API_KEY')
+        api_key = _get_api_key()
         
         if not api_key:
             return {
@@ -100,90 +257,87 @@ def get_gemini_response(user_message, chat_history):
                 'response': "AI service is not configured. Please contact your administrator to set up the GEMINI_API_KEY."
             }
         
-        genai.configure(api_key=api_key)
-        
-        # Create model
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # Build conversation history for context
-        conversation = [{"role": "user", "parts": [SYSTEM_PROMPT]}]
-        conversation.append({"role": "model", "parts": ["I understand. I'm Pulse Assistant, ready to help users with the contract management platform."]})
-        
-        # Add chat history (last few messages for context)
-        for msg in chat_history[-6:]:  # Last 6 messages for context
-            if msg.get('role') == 'user':
-                conversation.append({"role": "user", "parts": [msg.get('content', '')]})
-            elif msg.get('role') == 'assistant':
-                conversation.append({"role": "model", "parts": [msg.get('content', '')]})
-        
-        # Add current message
-        conversation.append({"role": "user", "parts": [user_message]})
-        
-        # Start chat and get response
-        chat = model.start_chat(history=conversation[:-1])
-        response = chat.send_message(user_message)
+        chat = _start_chat(api_key, chat_history)
+        response = await chat.send_message_async(user_message)
         
         return {
             'success': True,
             'response': response.text
         }
         
-    except ImportError:
-        return {
-            'success': False,
-            'response': "The AI module is not installed. Please run: pip install google-generativeai"
-        }
-    except Exception as e:
-        print(f"Gemini API error: {str(e)}")
+    except Exception:
+        logger.exception("Gemini API error")
         return {
             'success': False,
             'response': f"I'm having trouble connecting to the AI service. Please try again later."
         }
 
 
-def get_fallback_response(user_message):
+async def stream_gemini_response(user_message, chat_history):
     """
-    Provide helpful responses when AI is not available
+    Yield response text from Google Gemini as it is generated
     """
-    message_lower = user_message.lower()
+    if genai is None:
+        raise RuntimeError("google-generativeai is not installed")
     
-    # Navigation questions
-    if any(word in message_lower for word in ['where', 'find', 'navigate', 'go to', 'how to get']):
-        if 'contract' in message_lower and ('create' in message_lower or 'new' in message_lower):
-            return "To create a new contract, click the **'New Contract'** button on the dashboard or go to Contracts → click 'New Contract'."
-        if 'approval' in message_lower:
-            return "You can find approvals by clicking the **Approvals** link in the sidebar, or go to /contracts/approvals/"
-        if 'setting' in message_lower or 'config' in message_lower:
-            return "Settings are available at **Settings** in the sidebar (admin only), or go to /contracts/configurations/"
+    api_key = _get_api_key()
+    if not api_key:
+        raise RuntimeError("GEMINI_API_KEY is not configured")
     
-    # Status questions
-    if 'status' in message_lower:
-        return """Contract statuses are:
+    chat = _start_chat(api_key, chat_history)
+    async for part in await chat.send_message_async(user_message, stream=True):
+        if part.text:
+            yield part.text
+
+
+# Canned answers for common platform questions
+CREATE_NAV_RESPONSE = "To create a new contract, click the **'New Contract'** button on the dashboard or go to Contracts → click 'New Contract'."
+APPROVALS_NAV_RESPONSE = "You can find approvals by clicking the **Approvals** link in the sidebar, or go to /contracts/approvals/"
+SETTINGS_NAV_RESPONSE = "Settings are available at **Settings** in the sidebar (admin only), or go to /contracts/configurations/"
+STATUSES_RESPONSE = """Contract statuses are:
 • **Draft** - Being created/edited
 • **Pending** - Awaiting approval
 • **Active** - Currently in effect
 • **Expired** - Past end date
 • **Terminated** - Manually ended
 • **Archived** - Kept for records"""
-    
-    # Approval questions
-    if 'approval' in message_lower or 'approve' in message_lower:
-        return """To manage approvals:
+APPROVALS_RESPONSE = """To manage approvals:
 1. Open a contract detail page
 2. Click **'Request Approval'** button
 3. Select an approver and add a reason
 4. The approver will see it in their Approvals list"""
-    
-    # Create contract
-    if 'create' in message_lower and 'contract' in message_lower:
-        return """To create a contract:
+CREATE_RESPONSE = """To create a contract:
 1. Click **'New Contract'** on the dashboard
 2. Choose upload or template method
 3. Fill in the wizard steps
 4. Save as Draft or Submit for approval"""
-    
-    # Default response
-    return """I can help you with:
+
+# Fallback when the AI is unavailable, checked in order. Patterns mirror
+# plain substring checks on the message (case-insensitive).
+_NAV = r'(?=.*(?:where|find|navigate|go to|how to get))'
+
+INTENT_RE = [
+    (re.compile(_NAV + r'(?=.*contract)(?=.*(?:create|new))', re.I | re.S), CREATE_NAV_RESPONSE),
+    (re.compile(_NAV + r'(?=.*approval)', re.I | re.S), APPROVALS_NAV_RESPONSE),
+    (re.compile(_NAV + r'(?=.*(?:setting|config))', re.I | re.S), SETTINGS_NAV_RESPONSE),
+    (re.compile(r'(?=.*status)', re.I | re.S), STATUSES_RESPONSE),
+    (re.compile(r'(?=.*approv(?:al|e))', re.I | re.S), APPROVALS_RESPONSE),
+    (re.compile(r'(?=.*create)(?=.*contract)', re.I | re.S), CREATE_RESPONSE),
+]
+
+# Answered before the AI is called: only the whole-message questions the
+# help text suggests, so free-form questions that merely mention a status
+# or an approval still reach Gemini
+QUICK_ANSWER_RE = [
+    (re.compile(r'\s*where (?:can i find|are|is) (?:the )?approvals?\s*\??\s*', re.I), APPROVALS_NAV_RESPONSE),
+    (re.compile(r'\s*where (?:can i find|are|is) (?:the )?(?:settings|configurations?)\s*\??\s*', re.I),
+     SETTINGS_NAV_RESPONSE),
+    (re.compile(r'\s*(?:what are|list) (?:the )?(?:contract )?status(?:es)?\s*\??\s*', re.I), STATUSES_RESPONSE),
+    (re.compile(r'\s*how do(?:es)? (?:the )?approvals? work\s*\??\s*', re.I), APPROVALS_RESPONSE),
+    (re.compile(r'\s*how (?:do|can) i create (?:a |new |a new )?contracts?\s*\??\s*', re.I), CREATE_RESPONSE),
+]
+
+DEFAULT_HELP_RESPONSE = """I can help you with:
 • **Creating contracts** - "How do I create a contract?"
 • **Navigation** - "Where can I find approvals?"
 • **Statuses** - "What are the contract statuses?"
@@ -192,24 +346,132 @@ def get_fallback_response(user_message):
 What would you like to know?"""
 
 
+def match_intent(user_message):
+    """Return the canned answer for a recognised question, or None"""
+    for pattern, response in INTENT_RE:
+        if pattern.match(user_message):
+            return response
+    return None
+
+
+def match_quick_answer(user_message):
+    """Return the canned answer when the whole message is a help-text question"""
+    for pattern, response in QUICK_ANSWER_RE:
+        if pattern.fullmatch(user_message):
+            return response
+    return None
+
+
+def get_fallback_response(user_message):
+    """
+    Provide helpful responses when AI is not available
+    """
+    return match_intent(user_message) or DEFAULT_HELP_RESPONSE
+
+
+def _json_loads(body):
+    return orjson.loads(body)
+
+
+def _json_response(payload):
+    return HttpResponse(orjson.dumps(payload), content_type='application/json')
+
+
+def _ndjson(payload):
+    return orjson.dumps(payload) + b'\n'
+
+
+async def _stream_text(text):
+    yield _ndjson({'chunk': text})
+    yield _ndjson({'success': True, 'done': True})
+
+
+def _stream_lines(lines):
+    """
+    Wrap NDJSON lines in a response that proxies pass through unbuffered
+    """
+    response = StreamingHttpResponse(lines, content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def _stream_chat(user_message, chat_history, embedding):
+    """
+    Yield a Gemini reply as NDJSON chunks, falling back to the rule-based
+    answer if the AI fails before anything was sent
+    """
+    parts = []
+    try:
+        async for text in stream_gemini_response(user_message, chat_history):
+            parts.append(text)
+            yield _ndjson({'chunk': text})
+    except Exception:
+        logger.exception("Gemini API error")
+        if parts:
+            yield _ndjson({
+                'success': False,
+                'error': "The response was interrupted. Please try again."
+            })
+            return
+        yield _ndjson({'chunk': get_fallback_response(user_message)})
+    else:
+        if not chat_history:
+            await store_cached_response(user_message, ''.join(parts), embedding)
+    
+    yield _ndjson({'success': True, 'done': True})
+
+
 @require_http_methods(["POST"])
-def chat_api(request):
+async def chat_api(request):
     """
     API endpoint for chatbot
+    
+    Requests with "stream": true get the reply as NDJSON lines
+    ({"chunk": ...} then {"success": true, "done": true}) instead of a
+    single JSON object.
     """
     try:
-        data = json.loads(request.body)
+        data = _json_loads(request.body)
         user_message = data.get('message', '').strip()
-        chat_history = data.get('history', [])
+        chat_history = _trim_history(data.get('history'))
+        stream = bool(data.get('stream'))
         
         if not user_message:
-            return JsonResponse({
+            return _json_response({
                 'success': False,
                 'response': 'Please enter a message.'
             })
         
+        def reply(text):
+            if stream:
+                return _stream_lines(_stream_text(text))
+            return _json_response({
+                'success': True,
+                'response': text
+            })
+        
+        # Known questions are answered locally without calling the AI
+        intent_response = match_quick_answer(user_message)
+        if intent_response is not None:
+            return reply(intent_response)
+        
+        # Answers that depend on earlier turns are never cached
+        cached_response, embedding = None, None
+        if not chat_history:
+            cached_response, embedding = await lookup_cached_response(user_message)
+        
+        if cached_response is not None:
+            return reply(cached_response)
+        
+        if stream:
+            return _stream_lines(_stream_chat(user_message, chat_history, embedding))
+        
         # Try Gemini first, fall back to rule-based responses
-        result = get_gemini_response(user_message, chat_history)
+        result = await get_gemini_response(user_message, chat_history)
+        
+        if result['success'] and not chat_history:
+            await store_cached_response(user_message, result['response'], embedding)
         
         if not result['success']:
             # Use fallback responses
@@ -218,16 +480,16 @@ def chat_api(request):
                 'response': get_fallback_response(user_message)
             }
         
-        return JsonResponse(result)
+        return _json_response(result)
         
     except json.JSONDecodeError:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'response': 'Invalid request format.'
         })
-    except Exception as e:
-        print(f"Chat error: {str(e)}")
-        return JsonResponse({
+    except Exception:
+        logger.exception("Chat error")
+        return _json_response({
             'success': False,
             'response': 'An error occurred. Please try again.'
         })
@@ -0,0 +1,121 @@
+"""
+Memoized (id, label) choices for the small lookup tables behind dropdowns
+and filters.
+
+Each table has a version token in the Django cache that signals.py replaces
+whenever a row is saved or deleted, and again when the write commits.
+Choice lists are memoized per process for the current version, so a warm
+render costs one cache read and no SQL.
+
+Tokens expire after VERSION_TIMEOUT. With a per-process cache backend a bump
+only reaches the worker that made the write, so other workers pick up the
+change when their token lapses; a shared backend (Redis, memcached, the
+database cache) makes every bump visible at once.
+"""
+
+import uuid
+from functools import lru_cache
+from types import MappingProxyType
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Department, ContractType, Tag, ClausePlaybookEntry
+
+
+DEPARTMENTS = 'departments'
+CONTRACT_TYPES = 'contract_types'
+TAGS = 'tags'
+PLAYBOOK = 'playbook'
+USERS = 'users'
+# Not a choice list: bumped on every contract write, versions the cached
+# contract reports in ReportsService
+CONTRACTS = 'contracts'
+
+# Upper bound on how long a worker can serve choices from a version token
+# another worker has already replaced
+VERSION_TIMEOUT = 60
+
+
+def _version_key(table):
+    return f'contracts:choices_version:{table}'
+
+
+def get_version(table):
+    return cache.get_or_set(_version_key(table), lambda: uuid.uuid4().hex, VERSION_TIMEOUT)
+
+
+def _set_new_version(table):
+    # A fresh token rather than a counter, so an evicted key can never come
+    # back as a version some process has already memoized
+    cache.set(_version_key(table), uuid.uuid4().hex, VERSION_TIMEOUT)
+
+
+def bump_version(table):
+    _set_new_version(table)
+    if transaction.get_connection().in_atomic_block:
+        # Another reader may have memoized the pre-commit rows under the
+        # token just set; replace it again once the write is visible
+        transaction.on_commit(lambda: _set_new_version(table))
+
+
+@lru_cache(maxsize=1)
+def _department_choices(version):
+    return tuple(Department.objects.values_list('id', 'name'))
+
+
+@lru_cache(maxsize=2)
+def _contract_type_choices(version, active_only):
+    contract_types = ContractType.objects.all()
+    if active_only:
+        contract_types = contract_types.filter(active=True)
+    return tuple(contract_types.values_list('id', 'name'))
+
+
+@lru_cache(maxsize=1)
+def _active_tag_choices(version):
+    return tuple(Tag.objects.filter(active=True).values_list('id', 'name'))
+
+
+@lru_cache(maxsize=1)
+def _tag_table(version):
+    return MappingProxyType({
+        tag_id: MappingProxyType({'name': name, 'color': color})
+        for tag_id, name, color in Tag.objects.values_list('id', 'name', 'color')
+    })
+
+
+@lru_cache(maxsize=1)
+def _active_playbook_choices(version):
+    return tuple(ClausePlaybookEntry.objects.filter(active=True).values_list('id', 'label'))
+
+
+@lru_cache(maxsize=1)
+def _active_user_choices(version):
+    User = get_user_model()
+    return tuple(User.objects.filter(is_active=True).order_by('username').values_list('id', 'username'))
+
+
+def department_choices():
+    return _department_choices(get_version(DEPARTMENTS))
+
+
+def contract_type_choices(active_only=False):
+    return _contract_type_choices(get_version(CONTRACT_TYPES), active_only)
+
+
+def active_tag_choices():
+    return _active_tag_choices(get_version(TAGS))
+
+
+def tag_table():
+    return _tag_table(get_version(TAGS))
+
+
+def active_playbook_choices():
+    return _active_playbook_choices(get_version(PLAYBOOK))
+
+
+def active_user_choices():
+    return _active_user_choices(get_version(USERS))
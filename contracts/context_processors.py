@@ -0,0 +1,13 @@
+"""
+Template context processors for Contract Management module.
+"""
+
+from django.utils import timezone
+
+
+def today(request):
+    """
+    Today's date, worked out once per render for the date filters
+    (days_until, expiry_class) to take as their argument.
+    """
+    return {'today': timezone.now().date()}
@@ -3,6 +3,10 @@ Forms for Contract Management module.
 Includes forms for contract creation wizard, editing, and admin functions.
 """
 
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+
 from django import forms
 from django.core.validators import FileExtensionValidator
 from django.contrib.auth import get_user_model
@@ -11,9 +15,104 @@ from .models import (
     AdditionalApproval, Clause, ClausePlaybookEntry, Deviation,
     RiskItem, SignatureRecord, Department, ContractType, Tag
 )
+from . import choice_cache
+from .services import ContractQueryService
 
 User = get_user_model()
 
+# Shared by the upload forms
+_UPLOAD_VALIDATOR = FileExtensionValidator(allowed_extensions=('pdf', 'doc', 'docx', 'xlsx', 'xls'))
+_MAX_UPLOAD_SIZE = 20 * 1024 * 1024  # 20MB
+
+# Widget attrs shared by every form; widgets copy attrs on construction, so
+# read-only proxies are safe to hand out
+_FORM_CONTROL = MappingProxyType({'class': 'form-control'})
+_FORM_SELECT = MappingProxyType({'class': 'form-select'})
+_FORM_CHECK = MappingProxyType({'class': 'form-check-input'})
+_FORM_COLOR = MappingProxyType({'class': 'form-control form-control-color', 'type': 'color'})
+_FORM_DATE = MappingProxyType({'class': 'form-control', 'type': 'date'})
+
+
+@lru_cache(maxsize=16)
+def _textarea(rows, placeholder=None):
+    # Fields deepcopy their widget, so one instance per configuration can
+    # back every textarea that uses it
+    attrs = {'class': 'form-control', 'rows': rows}
+    if placeholder:
+        attrs['placeholder'] = placeholder
+    return forms.Textarea(attrs=attrs)
+
+
+# Choice lists materialized once; TextChoices.choices builds a new list per access
+_STATUS_CHOICES = tuple(Contract.Status.choices)
+_CATEGORY_CHOICES = tuple(Contract.Category.choices)
+_APPROVAL_STATUS_CHOICES = (('', 'All Statuses'),) + tuple(AdditionalApproval.Status.choices)
+
+# Dropdown querysets, limited to the columns their option labels use. Fields
+# clone these on assignment, so sharing them between forms is safe.
+_ACTIVE_USERS_QS = User.objects.filter(is_active=True).only(
+    'id', 'username', 'first_name', 'last_name'
+).order_by('username')
+_DEPARTMENTS_QS = Department.objects.only('id', 'name')
+_CONTRACT_TYPES_QS = ContractType.objects.only('id', 'name')
+
+
+class FastLabelChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField that labels options from one already-loaded column
+    instead of __str__, so rendering a large <select> never follows a
+    relation or loads a deferred field.
+    """
+
+    def __init__(self, queryset, *, label_field='name', **kwargs):
+        self.label_field = label_field
+        super().__init__(queryset, **kwargs)
+
+    def label_from_instance(self, obj):
+        return getattr(obj, self.label_field)
+
+
+class FastBoolField(forms.BooleanField):
+    """
+    BooleanField that returns CheckboxInput's already-parsed bool directly
+    and only falls back to string parsing for other widgets.
+    """
+
+    def to_python(self, value):
+        if value is True or value is False:
+            return value
+        return super().to_python(value)
+
+
+# ============================================================================
+# Cached Lookup Choices
+# ============================================================================
+# Wizard, clause and filter dropdowns are rebuilt on every render; take their
+# choices from choice_cache instead of querying the lookup tables.
+
+def department_choices():
+    return (('', '-- Select Department --'),) + choice_cache.department_choices()
+
+
+def contract_type_choices():
+    return (('', '-- Select Type --'),) + choice_cache.contract_type_choices(active_only=True)
+
+
+def tag_choices():
+    return choice_cache.active_tag_choices()
+
+
+def playbook_entry_choices():
+    return (('', '---------'),) + choice_cache.active_playbook_choices()
+
+
+def filter_department_choices():
+    return (('', 'All Departments'),) + choice_cache.department_choices()
+
+
+def filter_owner_choices():
+    return (('', 'All Owners'),) + choice_cache.active_user_choices()
+
 
 # ============================================================================
 # Contract Wizard Forms (Multi-step)
@@ -22,14 +121,14 @@ User = get_user_model()
 class ContractMethodForm(forms.Form):
     """Step 1: Choose contract creation method"""
     
-    METHOD_CHOICES = [
+    METHOD_CHOICES = (
         ('upload', 'Upload a document'),
         ('template', 'Draft from pre-existing template'),
-    ]
+    )
     
     method = forms.ChoiceField(
         choices=METHOD_CHOICES,
-        widget=forms.RadioSelect(attrs={'class': 'form-check-input'}),
+        widget=forms.RadioSelect(attrs=_FORM_CHECK),
         initial='upload'
     )
 
@@ -38,9 +137,7 @@ class ContractUploadForm(forms.Form):
     """Step 1b: Upload document"""
     
     file = forms.FileField(
-        validators=[FileExtensionValidator(
-            allowed_extensions=['pdf', 'doc', 'docx', 'xlsx', 'xls']
-        )],
+        validators=[_UPLOAD_VALIDATOR],
         widget=forms.FileInput(attrs={
             'class': 'form-control',
             'accept': '.pdf,.doc,.docx,.xlsx,.xls'
@@ -52,7 +149,7 @@ class ContractUploadForm(forms.Form):
         file = self.cleaned_data.get('file')
         if file:
             # Check file size (20MB limit)
-            if file.size > 20 * 1024 * 1024:
+            if file.size > _MAX_UPLOAD_SIZE:
                 raise forms.ValidationError('File size must be under 20MB.')
         return file
 
@@ -60,14 +157,14 @@ class ContractUploadForm(forms.Form):
 class ContractNameForm(forms.Form):
     """Step 2: Name your contract"""
     
-    SUGGESTIONS = [
+    SUGGESTIONS = (
         'Service Agreement - [Company Name]',
         'NDA - [Party Name] - [Date]',
         'Master Services Agreement',
         'Software License Agreement',
         'Vendor Agreement - [Vendor Name]',
         'Employment Contract - [Employee Name]',
-    ]
+    )
     
     title = forms.CharField(
         max_length=500,
@@ -86,35 +183,37 @@ class ContractBasicInfoForm(forms.Form):
     org_entity = forms.CharField(
         max_length=255,
         required=False,
-        widget=forms.TextInput(attrs={'class': 'form-control'}),
+        widget=forms.TextInput(attrs=_FORM_CONTROL),
         label='Organization Entity'
     )
     
     region_country = forms.CharField(
         max_length=100,
         required=False,
-        widget=forms.TextInput(attrs={'class': 'form-control'}),
+        widget=forms.TextInput(attrs=_FORM_CONTROL),
         label='Region / Country'
     )
     
-    bu_team = forms.ModelChoiceField(
-        queryset=Department.objects.all(),
+    bu_team = forms.TypedChoiceField(
+        choices=department_choices,
+        coerce=int,
+        empty_value=None,
         required=False,
-        widget=forms.Select(attrs={'class': 'form-select'}),
-        label='BU / Team',
-        empty_label='-- Select Department --'
+        widget=forms.Select(attrs=_FORM_SELECT),
+        label='BU / Team'
     )
     
-    category = forms.ChoiceField(
-        choices=Contract.Category.choices,
-        widget=forms.Select(attrs={'class': 'form-select'}),
+    category = forms.TypedChoiceField(
+        choices=_CATEGORY_CHOICES,
+        coerce=int,
+        widget=forms.Select(attrs=_FORM_SELECT),
         label='Category'
     )
     
     sub_category = forms.CharField(
         max_length=100,
         required=False,
-        widget=forms.TextInput(attrs={'class': 'form-control'}),
+        widget=forms.TextInput(attrs=_FORM_CONTROL),
         label='Sub-Category'
     )
 
@@ -133,20 +232,17 @@ class ContractPartyInfoForm(forms.Form):
     
     customer_or_vendor_address = forms.CharField(
         required=False,
-        widget=forms.Textarea(attrs={
-            'class': 'form-control',
-            'rows': 3,
-            'placeholder': 'Enter address...'
-        }),
+        widget=_textarea(3, 'Enter address...'),
         label='Address'
     )
     
-    contract_type = forms.ModelChoiceField(
-        queryset=ContractType.objects.filter(active=True),
+    contract_type = forms.TypedChoiceField(
+        choices=contract_type_choices,
+        coerce=int,
+        empty_value=None,
         required=False,
-        widget=forms.Select(attrs={'class': 'form-select'}),
-        label='Contract Type',
-        empty_label='-- Select Type --'
+        widget=forms.Select(attrs=_FORM_SELECT),
+        label='Contract Type'
     )
 
 
@@ -154,34 +250,25 @@ class ContractDatesForm(forms.Form):
     """Step 5: Contract dates and renewal"""
     
     effective_date = forms.DateField(
-        widget=forms.DateInput(attrs={
-            'class': 'form-control',
-            'type': 'date'
-        }),
+        widget=forms.DateInput(attrs=_FORM_DATE),
         label='Effective Date'
     )
     
     end_date = forms.DateField(
         required=False,
-        widget=forms.DateInput(attrs={
-            'class': 'form-control',
-            'type': 'date'
-        }),
+        widget=forms.DateInput(attrs=_FORM_DATE),
         label='End Date'
     )
     
     auto_renewal = forms.BooleanField(
         required=False,
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        widget=forms.CheckboxInput(attrs=_FORM_CHECK),
         label='Auto Renewal'
     )
     
     renewal_notice_date = forms.DateField(
         required=False,
-        widget=forms.DateInput(attrs={
-            'class': 'form-control',
-            'type': 'date'
-        }),
+        widget=forms.DateInput(attrs=_FORM_DATE),
         label='Renewal Notice Date',
         help_text='Date by which renewal notice must be given'
     )
@@ -204,14 +291,7 @@ class ContractDatesForm(forms.Form):
 class ContractValueForm(forms.Form):
     """Step 6: Contract value and additional info"""
     
-    CURRENCY_CHOICES = [
-        ('INR', 'INR - Indian Rupee'),
-        ('USD', 'USD - US Dollar'),
-        ('EUR', 'EUR - Euro'),
-        ('GBP', 'GBP - British Pound'),
-        ('AED', 'AED - UAE Dirham'),
-        ('SGD', 'SGD - Singapore Dollar'),
-    ]
+    CURRENCY_CHOICES = Contract.Currency.choices
     
     value_amount = forms.DecimalField(
         required=False,
@@ -227,8 +307,8 @@ class ContractValueForm(forms.Form):
     
     currency = forms.ChoiceField(
         choices=CURRENCY_CHOICES,
-        initial='INR',
-        widget=forms.Select(attrs={'class': 'form-select'}),
+        initial=Contract.Currency.INR,
+        widget=forms.Select(attrs=_FORM_SELECT),
         label='Currency'
     )
     
@@ -246,24 +326,26 @@ class ContractValueForm(forms.Form):
 class ContractOwnerTagsForm(forms.Form):
     """Step 7: Owner and tags"""
     
-    owner = forms.ModelChoiceField(
-        queryset=User.objects.filter(is_active=True),
+    owner = FastLabelChoiceField(
+        queryset=_ACTIVE_USERS_QS,
+        label_field='username',
         required=False,
-        widget=forms.Select(attrs={'class': 'form-select'}),
+        widget=forms.Select(attrs=_FORM_SELECT),
         label='Contract Owner',
         empty_label='-- Select Owner --'
     )
     
-    tags = forms.ModelMultipleChoiceField(
-        queryset=Tag.objects.filter(active=True),
+    tags = forms.TypedMultipleChoiceField(
+        choices=tag_choices,
+        coerce=int,
         required=False,
-        widget=forms.CheckboxSelectMultiple(attrs={'class': 'form-check-input'}),
+        widget=forms.CheckboxSelectMultiple(attrs=_FORM_CHECK),
         label='Tags'
     )
     
     is_confidential = forms.BooleanField(
         required=False,
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        widget=forms.CheckboxInput(attrs=_FORM_CHECK),
         label='Mark as Confidential',
         help_text='Confidential contracts are only visible to owner and shared users'
     )
@@ -286,32 +368,34 @@ class ContractForm(forms.ModelForm):
             'renewal_notice_date', 'assignment_status', 'owner', 'is_confidential'
         ]
         widgets = {
-            'title': forms.TextInput(attrs={'class': 'form-control'}),
-            'contract_number': forms.TextInput(attrs={'class': 'form-control'}),
-            'status': forms.Select(attrs={'class': 'form-select'}),
-            'category': forms.Select(attrs={'class': 'form-select'}),
-            'sub_category': forms.TextInput(attrs={'class': 'form-control'}),
-            'org_entity': forms.TextInput(attrs={'class': 'form-control'}),
-            'region_country': forms.TextInput(attrs={'class': 'form-control'}),
-            'bu_team': forms.Select(attrs={'class': 'form-select'}),
-            'customer_or_vendor_name': forms.TextInput(attrs={'class': 'form-control'}),
-            'customer_or_vendor_address': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
-            'contract_type': forms.Select(attrs={'class': 'form-select'}),
+            'title': forms.TextInput(attrs=_FORM_CONTROL),
+            'contract_number': forms.TextInput(attrs=_FORM_CONTROL),
+            'status': forms.Select(attrs=_FORM_SELECT),
+            'category': forms.Select(attrs=_FORM_SELECT),
+            'sub_category': forms.TextInput(attrs=_FORM_CONTROL),
+            'org_entity': forms.TextInput(attrs=_FORM_CONTROL),
+            'region_country': forms.TextInput(attrs=_FORM_CONTROL),
+            'bu_team': forms.Select(attrs=_FORM_SELECT),
+            'customer_or_vendor_name': forms.TextInput(attrs=_FORM_CONTROL),
+            'customer_or_vendor_address': _textarea(3),
+            'contract_type': forms.Select(attrs=_FORM_SELECT),
             'value_amount': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.01'}),
-            'currency': forms.TextInput(attrs={'class': 'form-control', 'maxlength': 8}),
-            'opportunity_id': forms.TextInput(attrs={'class': 'form-control'}),
-            'effective_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
-            'end_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
-            'auto_renewal': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
-            'renewal_notice_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
-            'assignment_status': forms.Select(attrs={'class': 'form-select'}),
-            'owner': forms.Select(attrs={'class': 'form-select'}),
-            'is_confidential': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+            'currency': forms.Select(attrs=_FORM_SELECT),
+            'opportunity_id': forms.TextInput(attrs=_FORM_CONTROL),
+            'effective_date': forms.DateInput(attrs=_FORM_DATE),
+            'end_date': forms.DateInput(attrs=_FORM_DATE),
+            'auto_renewal': forms.CheckboxInput(attrs=_FORM_CHECK),
+            'renewal_notice_date': forms.DateInput(attrs=_FORM_DATE),
+            'assignment_status': forms.Select(attrs=_FORM_SELECT),
+            'owner': forms.Select(attrs=_FORM_SELECT),
+            'is_confidential': forms.CheckboxInput(attrs=_FORM_CHECK),
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['owner'].queryset = User.objects.filter(is_active=True)
+        self.fields['owner'].queryset = _ACTIVE_USERS_QS
+        self.fields['bu_team'].queryset = _DEPARTMENTS_QS
+        self.fields['contract_type'].queryset = _CONTRACT_TYPES_QS
 
 
 # ============================================================================
@@ -329,13 +413,13 @@ class ContractFileUploadForm(forms.ModelForm):
                 'class': 'form-control',
                 'accept': '.pdf,.doc,.docx,.xlsx,.xls,.ppt,.pptx,.txt,.jpg,.jpeg,.png'
             }),
-            'is_primary': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
-            'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 2}),
+            'is_primary': forms.CheckboxInput(attrs=_FORM_CHECK),
+            'description': _textarea(2),
         }
 
     def clean_file(self):
         file = self.cleaned_data.get('file')
-        if file and file.size > 20 * 1024 * 1024:
+        if file and file.size > _MAX_UPLOAD_SIZE:
             raise forms.ValidationError('File size must be under 20MB.')
         return file
 
@@ -351,8 +435,8 @@ class ContractVersionForm(forms.ModelForm):
                 'class': 'form-control',
                 'placeholder': 'e.g., v1.0 - Initial Draft'
             }),
-            'file': forms.FileInput(attrs={'class': 'form-control'}),
-            'notes': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
+            'file': forms.FileInput(attrs=_FORM_CONTROL),
+            'notes': _textarea(3),
         }
 
 
@@ -367,18 +451,14 @@ class AdditionalApprovalRequestForm(forms.ModelForm):
         model = AdditionalApproval
         fields = ['approver', 'reason', 'due_date']
         widgets = {
-            'approver': forms.Select(attrs={'class': 'form-select'}),
-            'reason': forms.Textarea(attrs={
-                'class': 'form-control',
-                'rows': 3,
-                'placeholder': 'Explain why this approval is needed...'
-            }),
-            'due_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+            'approver': forms.Select(attrs=_FORM_SELECT),
+            'reason': _textarea(3, 'Explain why this approval is needed...'),
+            'due_date': forms.DateInput(attrs=_FORM_DATE),
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['approver'].queryset = User.objects.filter(is_active=True)
+        self.fields['approver'].queryset = _ACTIVE_USERS_QS
         self.fields['approver'].label_from_instance = lambda obj: f"{obj.get_full_name() or obj.username}"
 
 
@@ -392,16 +472,12 @@ class ApprovalDecisionForm(forms.Form):
     
     decision = forms.ChoiceField(
         choices=DECISION_CHOICES,
-        widget=forms.RadioSelect(attrs={'class': 'form-check-input'})
+        widget=forms.RadioSelect(attrs=_FORM_CHECK)
     )
     
     comment = forms.CharField(
         required=False,
-        widget=forms.Textarea(attrs={
-            'class': 'form-control',
-            'rows': 3,
-            'placeholder': 'Add a comment (optional for approval, required for rejection)...'
-        }),
+        widget=_textarea(3, 'Add a comment (optional for approval, required for rejection)...'),
         label='Decision Comment'
     )
 
@@ -425,7 +501,7 @@ class ContractShareForm(forms.ModelForm):
     
     share_type = forms.ChoiceField(
         choices=[('user', 'Specific User'), ('department', 'Department')],
-        widget=forms.RadioSelect(attrs={'class': 'form-check-input'}),
+        widget=forms.RadioSelect(attrs=_FORM_CHECK),
         initial='user'
     )
     
@@ -433,34 +509,36 @@ class ContractShareForm(forms.ModelForm):
         model = ContractShare
         fields = ['shared_with_user', 'shared_with_department', 'access_level']
         widgets = {
-            'shared_with_user': forms.Select(attrs={'class': 'form-select'}),
-            'shared_with_department': forms.Select(attrs={'class': 'form-select'}),
-            'access_level': forms.Select(attrs={'class': 'form-select'}),
+            'shared_with_user': forms.Select(attrs=_FORM_SELECT),
+            'shared_with_department': forms.Select(attrs=_FORM_SELECT),
+            'access_level': forms.Select(attrs=_FORM_SELECT),
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['shared_with_user'].queryset = User.objects.filter(is_active=True)
+        self.fields['shared_with_user'].queryset = _ACTIVE_USERS_QS
+        self.fields['shared_with_department'].queryset = _DEPARTMENTS_QS
         self.fields['shared_with_user'].required = False
         self.fields['shared_with_department'].required = False
 
+    # share_type -> (required field, field to clear, error message)
+    SHARE_TARGETS = {
+        'user': ('shared_with_user', 'shared_with_department', 'Please select a user to share with.'),
+        'department': ('shared_with_department', 'shared_with_user', 'Please select a department to share with.'),
+    }
+
     def clean(self):
         cleaned_data = super().clean()
-        share_type = cleaned_data.get('share_type')
-        user = cleaned_data.get('shared_with_user')
-        dept = cleaned_data.get('shared_with_department')
+        target = self.SHARE_TARGETS.get(cleaned_data.get('share_type'))
+        if target is None:
+            return cleaned_data  # share_type already failed validation
         
-        if share_type == 'user' and not user:
-            raise forms.ValidationError('Please select a user to share with.')
-        elif share_type == 'department' and not dept:
-            raise forms.ValidationError('Please select a department to share with.')
+        field, other_field, message = target
+        if not cleaned_data.get(field):
+            raise forms.ValidationError(message)
         
         # Clear the other field based on share type
-        if share_type == 'user':
-            cleaned_data['shared_with_department'] = None
-        else:
-            cleaned_data['shared_with_user'] = None
-        
+        cleaned_data[other_field] = None
         return cleaned_data
 
 
@@ -473,14 +551,16 @@ class ClauseForm(forms.ModelForm):
     
     use_playbook = forms.BooleanField(
         required=False,
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        widget=forms.CheckboxInput(attrs=_FORM_CHECK),
         label='Use Playbook Entry'
     )
     
-    playbook_entry = forms.ModelChoiceField(
-        queryset=ClausePlaybookEntry.objects.filter(active=True),
+    playbook_entry = forms.TypedChoiceField(
+        choices=playbook_entry_choices,
+        coerce=int,
+        empty_value=None,
         required=False,
-        widget=forms.Select(attrs={'class': 'form-select'}),
+        widget=forms.Select(attrs=_FORM_SELECT),
         label='Select from Playbook'
     )
     
@@ -488,9 +568,9 @@ class ClauseForm(forms.ModelForm):
         model = Clause
         fields = ['label', 'text', 'risk_level']
         widgets = {
-            'label': forms.TextInput(attrs={'class': 'form-control'}),
-            'text': forms.Textarea(attrs={'class': 'form-control', 'rows': 5}),
-            'risk_level': forms.Select(attrs={'class': 'form-select'}),
+            'label': forms.TextInput(attrs=_FORM_CONTROL),
+            'text': _textarea(5),
+            'risk_level': forms.Select(attrs=_FORM_SELECT),
         }
 
 
@@ -501,17 +581,26 @@ class DeviationForm(forms.ModelForm):
         model = Deviation
         fields = ['clause', 'description', 'risk_level', 'justification']
         widgets = {
-            'clause': forms.Select(attrs={'class': 'form-select'}),
-            'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
-            'risk_level': forms.Select(attrs={'class': 'form-select'}),
-            'justification': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
+            'clause': forms.Select(attrs=_FORM_SELECT),
+            'description': _textarea(3),
+            'risk_level': forms.Select(attrs=_FORM_SELECT),
+            'justification': _textarea(3),
         }
 
     def __init__(self, *args, contract=None, **kwargs):
         super().__init__(*args, **kwargs)
+        clause_field = self.fields['clause']
         if contract:
-            self.fields['clause'].queryset = Clause.objects.filter(contract=contract)
-        self.fields['clause'].required = False
+            # Every option belongs to this contract, so label by the clause
+            # alone and skip the join
+            clause_field.queryset = Clause.objects.filter(contract_id=contract.pk).only('id', 'label')
+            clause_field.label_from_instance = attrgetter('label')
+        else:
+            # Clause labels include the contract title
+            clause_field.queryset = Clause.objects.select_related('contract').only(
+                'id', 'label', 'contract__id', 'contract__title'
+            )
+        clause_field.required = False
 
 
 class RiskItemForm(forms.ModelForm):
@@ -521,13 +610,9 @@ class RiskItemForm(forms.ModelForm):
         model = RiskItem
         fields = ['description', 'severity', 'mitigation']
         widgets = {
-            'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
-            'severity': forms.Select(attrs={'class': 'form-select'}),
-            'mitigation': forms.Textarea(attrs={
-                'class': 'form-control',
-                'rows': 3,
-                'placeholder': 'Describe mitigation strategy...'
-            }),
+            'description': _textarea(3),
+            'severity': forms.Select(attrs=_FORM_SELECT),
+            'mitigation': _textarea(3, 'Describe mitigation strategy...'),
         }
 
 
@@ -545,12 +630,12 @@ class SignatureRecordForm(forms.ModelForm):
             'signatory_designation', 'sign_type'
         ]
         widgets = {
-            'party': forms.Select(attrs={'class': 'form-select'}),
-            'signatory_name': forms.TextInput(attrs={'class': 'form-control'}),
-            'signatory_email': forms.EmailInput(attrs={'class': 'form-control'}),
-            'signatory_phone': forms.TextInput(attrs={'class': 'form-control'}),
-            'signatory_designation': forms.TextInput(attrs={'class': 'form-control'}),
-            'sign_type': forms.Select(attrs={'class': 'form-select'}),
+            'party': forms.Select(attrs=_FORM_SELECT),
+            'signatory_name': forms.TextInput(attrs=_FORM_CONTROL),
+            'signatory_email': forms.EmailInput(attrs=_FORM_CONTROL),
+            'signatory_phone': forms.TextInput(attrs=_FORM_CONTROL),
+            'signatory_designation': forms.TextInput(attrs=_FORM_CONTROL),
+            'sign_type': forms.Select(attrs=_FORM_SELECT),
         }
 
 
@@ -565,9 +650,9 @@ class ContractTypeForm(forms.ModelForm):
         model = ContractType
         fields = ['name', 'description', 'active']
         widgets = {
-            'name': forms.TextInput(attrs={'class': 'form-control'}),
-            'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
-            'active': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+            'name': forms.TextInput(attrs=_FORM_CONTROL),
+            'description': _textarea(3),
+            'active': forms.CheckboxInput(attrs=_FORM_CHECK),
         }
 
 
@@ -578,10 +663,10 @@ class TagForm(forms.ModelForm):
         model = Tag
         fields = ['name', 'description', 'color', 'active']
         widgets = {
-            'name': forms.TextInput(attrs={'class': 'form-control'}),
-            'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 2}),
-            'color': forms.TextInput(attrs={'class': 'form-control form-control-color', 'type': 'color'}),
-            'active': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+            'name': forms.TextInput(attrs=_FORM_CONTROL),
+            'description': _textarea(2),
+            'color': forms.TextInput(attrs=_FORM_COLOR),
+            'active': forms.CheckboxInput(attrs=_FORM_CHECK),
         }
 
 
@@ -592,12 +677,12 @@ class ClausePlaybookEntryForm(forms.ModelForm):
         model = ClausePlaybookEntry
         fields = ['label', 'category', 'recommended_text', 'risk_level', 'guidance_notes', 'active']
         widgets = {
-            'label': forms.TextInput(attrs={'class': 'form-control'}),
-            'category': forms.TextInput(attrs={'class': 'form-control'}),
-            'recommended_text': forms.Textarea(attrs={'class': 'form-control', 'rows': 5}),
-            'risk_level': forms.Select(attrs={'class': 'form-select'}),
-            'guidance_notes': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
-            'active': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+            'label': forms.TextInput(attrs=_FORM_CONTROL),
+            'category': forms.TextInput(attrs=_FORM_CONTROL),
+            'recommended_text': _textarea(5),
+            'risk_level': forms.Select(attrs=_FORM_SELECT),
+            'guidance_notes': _textarea(3),
+            'active': forms.CheckboxInput(attrs=_FORM_CHECK),
         }
 
 
@@ -608,7 +693,7 @@ class DepartmentForm(forms.ModelForm):
         model = Department
         fields = ['name']
         widgets = {
-            'name': forms.TextInput(attrs={'class': 'form-control'}),
+            'name': forms.TextInput(attrs=_FORM_CONTROL),
         }
 
 
@@ -627,69 +712,83 @@ class ContractFilterForm(forms.Form):
         })
     )
     
-    status = forms.MultipleChoiceField(
-        choices=Contract.Status.choices,
+    status = forms.TypedMultipleChoiceField(
+        choices=_STATUS_CHOICES,
+        coerce=int,
         required=False,
-        widget=forms.CheckboxSelectMultiple(attrs={'class': 'form-check-input'})
+        widget=forms.CheckboxSelectMultiple(attrs=_FORM_CHECK)
     )
     
-    category = forms.MultipleChoiceField(
-        choices=Contract.Category.choices,
+    category = forms.TypedMultipleChoiceField(
+        choices=_CATEGORY_CHOICES,
+        coerce=int,
         required=False,
-        widget=forms.CheckboxSelectMultiple(attrs={'class': 'form-check-input'})
+        widget=forms.CheckboxSelectMultiple(attrs=_FORM_CHECK)
     )
     
-    bu_team = forms.ModelChoiceField(
-        queryset=Department.objects.all(),
+    bu_team = forms.TypedChoiceField(
+        choices=filter_department_choices,
+        coerce=int,
+        empty_value=None,
         required=False,
-        widget=forms.Select(attrs={'class': 'form-select'}),
-        empty_label='All Departments'
+        widget=forms.Select(attrs=_FORM_SELECT)
     )
     
-    owner = forms.ModelChoiceField(
-        queryset=User.objects.filter(is_active=True),
+    owner = forms.TypedChoiceField(
+        choices=filter_owner_choices,
+        coerce=int,
+        empty_value=None,
         required=False,
-        widget=forms.Select(attrs={'class': 'form-select'}),
-        empty_label='All Owners'
+        widget=forms.Select(attrs=_FORM_SELECT)
     )
     
     date_from = forms.DateField(
         required=False,
-        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+        widget=forms.DateInput(attrs=_FORM_DATE),
         label='Created From'
     )
     
     date_to = forms.DateField(
         required=False,
-        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+        widget=forms.DateInput(attrs=_FORM_DATE),
         label='Created To'
     )
     
-    tags = forms.ModelMultipleChoiceField(
-        queryset=Tag.objects.filter(active=True),
+    tags = forms.TypedMultipleChoiceField(
+        choices=tag_choices,
+        coerce=int,
         required=False,
-        widget=forms.CheckboxSelectMultiple(attrs={'class': 'form-check-input'})
+        widget=forms.CheckboxSelectMultiple(attrs=_FORM_CHECK)
     )
+    
+    def clean_search(self):
+        # Collapse whitespace so the icontains and websearch queries see
+        # the same terms
+        return ' '.join(self.cleaned_data['search'].split())
+    
+    def to_q(self):
+        """Return the submitted filters as a single Q object"""
+        return ContractQueryService.build_filter_q(self.cleaned_data)
 
 
 class ApprovalFilterForm(forms.Form):
     """Form for filtering approval list"""
     
     status = forms.ChoiceField(
-        choices=[('', 'All Statuses')] + list(AdditionalApproval.Status.choices),
+        choices=_APPROVAL_STATUS_CHOICES,
         required=False,
-        widget=forms.Select(attrs={'class': 'form-select'})
+        widget=forms.Select(attrs=_FORM_SELECT)
     )
     
-    assigned_to_me = forms.BooleanField(
+    assigned_to_me = FastBoolField(
         required=False,
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        widget=forms.CheckboxInput(attrs=_FORM_CHECK),
         label='Assigned to me'
     )
     
-    requested_by_me = forms.BooleanField(
+    requested_by_me = FastBoolField(
         required=False,
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        widget=forms.CheckboxInput(attrs=_FORM_CHECK),
         label='Requested by me'
     )
 
@@ -701,17 +800,14 @@ class ApprovalFilterForm(forms.Form):
 class StatusChangeForm(forms.Form):
     """Form for changing contract status"""
     
-    new_status = forms.ChoiceField(
-        choices=Contract.Status.choices,
-        widget=forms.Select(attrs={'class': 'form-select'})
+    new_status = forms.TypedChoiceField(
+        choices=_STATUS_CHOICES,
+        coerce=int,
+        widget=forms.Select(attrs=_FORM_SELECT)
     )
     
     reason = forms.CharField(
         required=False,
-        widget=forms.Textarea(attrs={
-            'class': 'form-control',
-            'rows': 2,
-            'placeholder': 'Reason for status change (optional)...'
-        })
+        widget=_textarea(2, 'Reason for status change (optional)...')
     )
 
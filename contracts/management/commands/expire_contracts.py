@@ -0,0 +1,19 @@
+"""
+Mark active contracts past their end date as expired.
+
+Meant to run nightly from cron:
+
+    python manage.py expire_contracts
+"""
+
+from django.core.management.base import BaseCommand
+
+from contracts.models import Contract
+
+
+class Command(BaseCommand):
+    help = 'Mark active contracts whose end date has passed as expired'
+
+    def handle(self, *args, **options):
+        count = Contract.objects.mark_expired()
+        self.stdout.write(f'Marked {count} contract(s) as expired.')
@@ -2,8 +2,20 @@
 Middleware for Contract Management module.
 """
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.db import IntegrityError, transaction
+from django.utils.functional import SimpleLazyObject
+
+from .models import AuditLog
+
+
+# Columns loaded for the demo user; anything else is fetched on first access
+MOCK_USER_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser',
+)
 
 
 class MockUserMiddleware:
@@ -11,32 +23,93 @@ class MockUserMiddleware:
     Middleware to provide a mock authenticated user for demo purposes.
     Remove this in production and use proper authentication.
     """
-    
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
-        self._mock_user = None
-    
+        self._mock_user_row = None
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
         # Create or get a mock user for demo
         if not request.user.is_authenticated:
-            request.user = self.get_mock_user()
-        
+            request.user = SimpleLazyObject(self.get_mock_user)
+
         response = self.get_response(request)
         return response
-    
+
+    async def __acall__(self, request):
+        # request.user would load the session user synchronously
+        user = await request.auser()
+        if not user.is_authenticated:
+            request.user = SimpleLazyObject(self.get_mock_user)
+
+        response = await self.get_response(request)
+        return response
+
     def get_mock_user(self):
-        if self._mock_user is None:
-            User = get_user_model()
-            # Try to get existing demo user or create one
-            self._mock_user, created = User.objects.get_or_create(
-                username='demo_user',
-                defaults={
-                    'email': 'demo@netcore.com',
-                    'first_name': 'Demo',
-                    'last_name': 'User',
-                    'is_staff': True,  # Give admin access for demo
-                    'is_superuser': True,
-                }
-            )
-        return self._mock_user
+        # The row is read once per process; each request gets its own
+        # instance so nothing cached on the user leaks between requests
+        User = get_user_model()
+        if self._mock_user_row is None:
+            self._mock_user_row = self._load_mock_user_row(User)
+        return User.from_db(User.objects.db, MOCK_USER_FIELDS, self._mock_user_row)
+
+    def _load_mock_user_row(self, User):
+        demo_user = User.objects.filter(username='demo_user').values_list(*MOCK_USER_FIELDS)
+        row = demo_user.first()
+        if row is None:
+            try:
+                with transaction.atomic():
+                    User.objects.create(
+                        username='demo_user',
+                        email='demo@netcore.com',
+                        first_name='Demo',
+                        last_name='User',
+                        is_staff=True,  # Give admin access for demo
+                        is_superuser=True,
+                    )
+            except IntegrityError:
+                pass  # Created by a concurrent request
+            row = demo_user.first()
+        return row
+
 
+class AuditLogBufferMiddleware:
+    """
+    Collects audit log entries logged against the request and writes them
+    in one bulk INSERT after the view has produced its response.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request.audit_log_buffer = []
+        response = self.get_response(request)
+        if request.audit_log_buffer:
+            AuditLog.bulk_log(request.audit_log_buffer)
+            request.audit_log_buffer = []
+        return response
+
+    async def __acall__(self, request):
+        request.audit_log_buffer = []
+        response = await self.get_response(request)
+        if request.audit_log_buffer:
+            await AuditLog.abulk_log(request.audit_log_buffer)
+            request.audit_log_buffer = []
+        return response
@@ -0,0 +1,32 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+# Expression index backing ContractAdmin full-text search. PostgreSQL only;
+# other backends keep the default icontains search.
+CONTRACT_SEARCH_INDEX = GinIndex(
+    SearchVector('title', 'customer_or_vendor_name', 'contract_number', config='english'),
+    name='contract_search_gin',
+)
+
+
+def add_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('contracts', 'Contract'), CONTRACT_SEARCH_INDEX)
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('contracts', 'Contract'), CONTRACT_SEARCH_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_index, remove_search_index),
+    ]
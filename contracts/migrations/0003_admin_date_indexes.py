@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0002_contract_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='additionalapproval',
+            index=models.Index(fields=['created_at'], name='contracts_a_created_0547cd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['category', 'created_at'], name='contracts_c_categor_5c0f63_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contractfile',
+            index=models.Index(fields=['uploaded_at'], name='contracts_c_uploade_d5a9fa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contractversion',
+            index=models.Index(fields=['created_at'], name='contracts_c_created_27097c_idx'),
+        ),
+    ]
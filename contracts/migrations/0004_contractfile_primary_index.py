@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0003_admin_date_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contractfile',
+            index=models.Index(fields=['contract', 'is_primary'], name='cf_contract_primary_idx'),
+        ),
+    ]
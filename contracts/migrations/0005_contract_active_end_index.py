@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0004_contractfile_primary_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(condition=models.Q(('end_date__isnull', False), ('status', 'ACTIVE')), fields=['end_date'], name='contract_active_end_idx'),
+        ),
+    ]
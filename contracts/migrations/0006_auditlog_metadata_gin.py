@@ -0,0 +1,39 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.db import migrations
+
+
+# Containment (metadata__contains) lookups on audit log metadata. PostgreSQL
+# only, built concurrently so the audit table stays writable; jsonb_path_ops
+# keeps the index small since only @> is needed.
+AUDITLOG_METADATA_INDEX = GinIndex(
+    fields=['metadata'],
+    name='auditlog_meta_gin',
+    opclasses=['jsonb_path_ops'],
+)
+
+
+def add_metadata_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(
+            apps.get_model('contracts', 'AuditLog'), AUDITLOG_METADATA_INDEX, concurrently=True
+        )
+
+
+def remove_metadata_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(
+            apps.get_model('contracts', 'AuditLog'), AUDITLOG_METADATA_INDEX, concurrently=True
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('contracts', '0005_contract_active_end_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_metadata_index, remove_metadata_index),
+    ]
@@ -0,0 +1,83 @@
+from django.db import migrations, models
+
+
+# Frozen copy of AuditLog.Action at the time of the conversion
+ACTION_CODES = {
+    'CREATE_CONTRACT': 1,
+    'UPDATE_CONTRACT': 2,
+    'DELETE_CONTRACT': 3,
+    'CHANGE_STATUS': 4,
+    'ADD_FILE': 5,
+    'REMOVE_FILE': 6,
+    'ADD_VERSION': 7,
+    'CREATE_APPROVAL': 8,
+    'APPROVE': 9,
+    'REJECT': 10,
+    'CANCEL_APPROVAL': 11,
+    'SHARE': 12,
+    'UNSHARE': 13,
+    'ADD_CLAUSE': 14,
+    'UPDATE_CLAUSE': 15,
+    'ADD_DEVIATION': 16,
+    'ADD_RISK': 17,
+    'ADD_SIGNATURE': 18,
+    'SIGN': 19,
+    'VIEW': 20,
+    'DOWNLOAD': 21,
+}
+
+
+def action_names_to_codes(apps, schema_editor):
+    AuditLog = apps.get_model('contracts', 'AuditLog')
+    for name, code in ACTION_CODES.items():
+        AuditLog.objects.filter(action=name).update(action_code=code)
+
+
+def action_codes_to_names(apps, schema_editor):
+    AuditLog = apps.get_model('contracts', 'AuditLog')
+    for name, code in ACTION_CODES.items():
+        AuditLog.objects.filter(action_code=code).update(action=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0006_auditlog_metadata_gin'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='contracts_a_contrac_52a69d_idx',
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='action_code',
+            field=models.SmallIntegerField(null=True),
+        ),
+        # Nullable so the old column can be re-added when migrating back
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(max_length=50, null=True),
+        ),
+        migrations.RunPython(action_names_to_codes, action_codes_to_names),
+        migrations.RemoveField(
+            model_name='auditlog',
+            name='action',
+        ),
+        migrations.RenameField(
+            model_name='auditlog',
+            old_name='action_code',
+            new_name='action',
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.SmallIntegerField(choices=[(1, 'Contract Created'), (2, 'Contract Updated'), (3, 'Contract Deleted'), (4, 'Status Changed'), (5, 'File Added'), (6, 'File Removed'), (7, 'Version Added'), (8, 'Approval Requested'), (9, 'Approved'), (10, 'Rejected'), (11, 'Approval Cancelled'), (12, 'Contract Shared'), (13, 'Share Removed'), (14, 'Clause Added'), (15, 'Clause Updated'), (16, 'Deviation Added'), (17, 'Risk Added'), (18, 'Signature Added'), (19, 'Document Signed'), (20, 'Contract Viewed'), (21, 'File Downloaded')], db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['contract', 'action', 'created_at'], name='contracts_a_contrac_52a69d_idx'),
+        ),
+    ]
@@ -0,0 +1,128 @@
+from django.db import migrations, models
+
+
+# Frozen copies of the Contract choice enums at the time of the conversion
+STATUS_CODES = {
+    'DRAFT': 1,
+    'PENDING': 2,
+    'ACTIVE': 3,
+    'EXPIRED': 4,
+    'TERMINATED': 5,
+    'ARCHIVED': 6,
+}
+
+ASSIGNMENT_STATUS_CODES = {
+    'NOT_ASSIGNED': 1,
+    'IN_PROGRESS': 2,
+    'COMPLETED': 3,
+}
+
+CATEGORY_CODES = {
+    'SALES': 1,
+    'PROCUREMENT': 2,
+    'HR': 3,
+    'LEGAL': 4,
+    'FINANCE': 5,
+    'PARTNERSHIP': 6,
+    'NDA': 7,
+    'SERVICE': 8,
+    'OTHER': 9,
+}
+
+FIELD_CODES = {
+    'status': STATUS_CODES,
+    'assignment_status': ASSIGNMENT_STATUS_CODES,
+    'category': CATEGORY_CODES,
+}
+
+
+def names_to_codes(apps, schema_editor):
+    Contract = apps.get_model('contracts', 'Contract')
+    for field, codes in FIELD_CODES.items():
+        for name, code in codes.items():
+            Contract.objects.filter(**{field: name}).update(**{f'{field}_code': code})
+
+
+def codes_to_names(apps, schema_editor):
+    Contract = apps.get_model('contracts', 'Contract')
+    for field, codes in FIELD_CODES.items():
+        for name, code in codes.items():
+            Contract.objects.filter(**{f'{field}_code': code}).update(**{field: name})
+
+
+def convert_field(name):
+    # Copy the codes into a temporary column, then swap it in. The old
+    # column is made nullable first so it can be re-added when migrating
+    # back.
+    return [
+        migrations.AddField(
+            model_name='contract',
+            name=f'{name}_code',
+            field=models.SmallIntegerField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='contract',
+            name=name,
+            field=models.CharField(max_length=50, null=True),
+        ),
+    ]
+
+
+def swap_field(name, field):
+    return [
+        migrations.RemoveField(
+            model_name='contract',
+            name=name,
+        ),
+        migrations.RenameField(
+            model_name='contract',
+            old_name=f'{name}_code',
+            new_name=name,
+        ),
+        migrations.AlterField(
+            model_name='contract',
+            name=name,
+            field=field,
+        ),
+    ]
+
+
+STATUS_INDEXES = [
+    models.Index(fields=['status', 'created_at'], name='contracts_c_status_efee21_idx'),
+    models.Index(fields=['category', 'created_at'], name='contracts_c_categor_5c0f63_idx'),
+    models.Index(fields=['owner', 'status'], name='contracts_c_owner_i_e4a87d_idx'),
+    models.Index(fields=['end_date', 'status'], name='contracts_c_end_dat_8fe405_idx'),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0007_auditlog_action_smallint'),
+    ]
+
+    operations = [
+        *[
+            migrations.RemoveIndex(model_name='contract', name=index.name)
+            for index in STATUS_INDEXES
+        ],
+        migrations.RemoveIndex(
+            model_name='contract',
+            name='contract_active_end_idx',
+        ),
+        *convert_field('status'),
+        *convert_field('assignment_status'),
+        *convert_field('category'),
+        migrations.RunPython(names_to_codes, codes_to_names),
+        *swap_field('status', models.SmallIntegerField(choices=[(1, 'Draft'), (2, 'Pending'), (3, 'Active'), (4, 'Expired'), (5, 'Terminated'), (6, 'Archived')], db_index=True, default=1)),
+        *swap_field('assignment_status', models.SmallIntegerField(choices=[(1, 'Not Assigned'), (2, 'In Progress'), (3, 'Completed')], default=1)),
+        *swap_field('category', models.SmallIntegerField(choices=[(1, 'Sales'), (2, 'Procurement'), (3, 'Human Resources'), (4, 'Legal'), (5, 'Finance'), (6, 'Partnership'), (7, 'Non-Disclosure Agreement'), (8, 'Service Agreement'), (9, 'Other')], default=9)),
+        *[
+            migrations.AddIndex(model_name='contract', index=index)
+            for index in STATUS_INDEXES
+        ],
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(condition=models.Q(('end_date__isnull', False), ('status', 3)), fields=['end_date'], name='contract_active_end_idx'),
+        ),
+    ]
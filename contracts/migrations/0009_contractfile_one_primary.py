@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def keep_newest_primary_file(apps, schema_editor):
+    # Demote all but the most recently uploaded primary file per contract so
+    # the constraint can be added
+    ContractFile = apps.get_model('contracts', 'ContractFile')
+    seen = set()
+    demote = []
+    primaries = ContractFile.objects.filter(is_primary=True).order_by('contract_id', '-uploaded_at', '-id')
+    for file_id, contract_id in primaries.values_list('id', 'contract_id'):
+        if contract_id in seen:
+            demote.append(file_id)
+        seen.add(contract_id)
+    if demote:
+        ContractFile.objects.filter(id__in=demote).update(is_primary=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0008_contract_choice_fields_smallint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_newest_primary_file, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='contractfile',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_primary', True)), fields=('contract',), name='one_primary_per_contract'),
+        ),
+    ]
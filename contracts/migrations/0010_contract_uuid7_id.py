@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:03
+
+import contracts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0009_contractfile_one_primary'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contract',
+            name='id',
+            field=models.UUIDField(default=contracts.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0010_contract_uuid7_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contract',
+            name='end_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='contract',
+            name='status',
+            field=models.SmallIntegerField(choices=[(1, 'Draft'), (2, 'Pending'), (3, 'Active'), (4, 'Expired'), (5, 'Terminated'), (6, 'Archived')], default=1),
+        ),
+    ]
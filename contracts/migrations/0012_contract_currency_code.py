@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:10
+
+from django.db import migrations, models
+
+
+def normalize_currency_codes(apps, schema_editor):
+    # Trim and uppercase stored codes; anything that still isn't a three
+    # letter code cannot fit the narrower column and falls back to INR
+    Contract = apps.get_model('contracts', 'Contract')
+    codes = Contract.objects.values_list('currency', flat=True).distinct()
+    for code in list(codes):
+        normalized = code.strip().upper()
+        if len(normalized) != 3 or not normalized.isalpha():
+            normalized = 'INR'
+        if normalized != code:
+            Contract.objects.filter(currency=code).update(currency=normalized)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0011_contract_drop_redundant_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_currency_codes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='contract',
+            name='currency',
+            field=models.CharField(choices=[('INR', 'INR - Indian Rupee'), ('USD', 'USD - US Dollar'), ('EUR', 'EUR - Euro'), ('GBP', 'GBP - British Pound'), ('AED', 'AED - UAE Dirham'), ('SGD', 'SGD - Singapore Dollar')], default='INR', max_length=3),
+        ),
+    ]
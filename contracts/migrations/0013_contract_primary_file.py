@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def set_primary_files(apps, schema_editor):
+    Contract = apps.get_model('contracts', 'Contract')
+    ContractFile = apps.get_model('contracts', 'ContractFile')
+    Contract.objects.update(primary_file=models.Subquery(
+        ContractFile.objects.filter(
+            contract=models.OuterRef('pk'), is_primary=True
+        ).values('pk')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0012_contract_currency_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contract',
+            name='primary_file',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contracts.contractfile'),
+        ),
+        migrations.RunPython(set_primary_files, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:16
+
+import contracts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0013_contract_primary_file'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='metadata',
+            field=models.JSONField(blank=True, decoder=contracts.models.OrjsonDecoder, default=dict, encoder=contracts.models.OrjsonEncoder),
+        ),
+        migrations.AlterField(
+            model_name='contract',
+            name='extra_metadata',
+            field=models.JSONField(blank=True, decoder=contracts.models.OrjsonDecoder, default=dict, encoder=contracts.models.OrjsonEncoder),
+        ),
+    ]
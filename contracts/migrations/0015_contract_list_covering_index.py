@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+# Contract listings order by -created_at and show the number, title, status
+# and end date; INCLUDE carries those columns in the index so PostgreSQL can
+# answer a page with an index-only scan. PostgreSQL only (other backends
+# would build a plain duplicate of the created_at index), built concurrently
+# so the contract table stays writable.
+CONTRACT_LIST_INDEX = models.Index(
+    fields=['-created_at'],
+    name='contract_list_covering',
+    include=['id', 'contract_number', 'title', 'status', 'end_date'],
+)
+
+
+def add_list_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(
+            apps.get_model('contracts', 'Contract'), CONTRACT_LIST_INDEX, concurrently=True
+        )
+
+
+def remove_list_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(
+            apps.get_model('contracts', 'Contract'), CONTRACT_LIST_INDEX, concurrently=True
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('contracts', '0014_orjson_json_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_list_index, remove_list_index),
+    ]
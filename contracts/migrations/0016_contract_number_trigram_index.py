@@ -0,0 +1,41 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+# Trigram index for partial contract number matches (contract_number__icontains
+# compiles to UPPER(contract_number) LIKE ...), which full-text search cannot
+# answer. PostgreSQL only, built concurrently so the contract table stays
+# writable.
+CONTRACT_NUMBER_TRGM_INDEX = GinIndex(
+    OpClass(Upper('contract_number'), name='gin_trgm_ops'),
+    name='contract_number_trgm',
+)
+
+
+def add_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.add_index(
+            apps.get_model('contracts', 'Contract'), CONTRACT_NUMBER_TRGM_INDEX, concurrently=True
+        )
+
+
+def remove_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(
+            apps.get_model('contracts', 'Contract'), CONTRACT_NUMBER_TRGM_INDEX, concurrently=True
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('contracts', '0015_contract_list_covering_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trigram_index, remove_trigram_index),
+    ]
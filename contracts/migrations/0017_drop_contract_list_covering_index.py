@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+# Contract listings load every column and join the related tables, so no
+# list query can be answered from contract_list_covering; the created_at
+# index already serves the ordering. Dropped concurrently on PostgreSQL, the
+# only backend that built it.
+CONTRACT_LIST_INDEX = models.Index(
+    fields=['-created_at'],
+    name='contract_list_covering',
+    include=['id', 'contract_number', 'title', 'status', 'end_date'],
+)
+
+
+def remove_list_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(
+            apps.get_model('contracts', 'Contract'), CONTRACT_LIST_INDEX, concurrently=True
+        )
+
+
+def add_list_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(
+            apps.get_model('contracts', 'Contract'), CONTRACT_LIST_INDEX, concurrently=True
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('contracts', '0016_contract_number_trigram_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_list_index, add_list_index),
+    ]
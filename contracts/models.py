@@ -1,10 +1,41 @@
+import json
+import os
+import time
 import uuid
-from django.db import models
+from datetime import timedelta
+from operator import itemgetter
+import orjson
+from django.db import DatabaseError, models, transaction
 from django.conf import settings
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.core.validators import FileExtensionValidator
 
 
+def uuid7():
+    """Time-ordered UUID (RFC 9562 version 7): 48-bit ms timestamp, then random bits"""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
+class OrjsonEncoder(json.JSONEncoder):
+    """JSONField encoder that serializes with orjson"""
+
+    def encode(self, o):
+        # Values orjson rejects (e.g. integers past 64 bits) raise rather
+        # than being written in a form OrjsonDecoder would misread
+        return orjson.dumps(o, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class OrjsonDecoder(json.JSONDecoder):
+    """JSONField decoder that parses with orjson"""
+
+    def decode(self, s, *args, **kwargs):
+        return orjson.loads(s)
+
+
 class Department(models.Model):
     """Department/Business Unit model"""
     id = models.AutoField(primary_key=True)
@@ -55,49 +86,205 @@ class Tag(models.Model):
         return self.name
 
 
+def _invalidate_contract_reports():
+    from .choice_cache import CONTRACTS, bump_version
+    bump_version(CONTRACTS)
+
+
+class ContractQuerySet(models.QuerySet):
+
+    def with_related(self, primary_file=False):
+        """
+        Load the relations contract pages show alongside each contract:
+        owner, creator, department, type and tags. With primary_file, also
+        join each contract's primary file.
+        """
+        queryset = self.select_related(
+            'owner', 'bu_team', 'contract_type', 'created_by'
+        ).prefetch_related('tags')
+        if primary_file:
+            queryset = queryset.select_related('primary_file')
+        return queryset
+
+    def with_share_flags(self, user):
+        """
+        Annotate has_user_share and has_user_edit_share (and the has_dept_*
+        pair when the user has a department) as EXISTS subqueries, so
+        can_view_contract and can_edit_contract need no query per contract.
+        """
+        shares = ContractShare.objects.filter(contract=models.OuterRef('pk'))
+        flags = {
+            'has_user_share': models.Exists(shares.filter(shared_with_user=user)),
+            'has_user_edit_share': models.Exists(shares.filter(shared_with_user=user, access_level='EDIT')),
+        }
+        department = getattr(user, 'department', None)
+        if department:
+            flags['has_dept_share'] = models.Exists(shares.filter(shared_with_department=department))
+            flags['has_dept_edit_share'] = models.Exists(
+                shares.filter(shared_with_department=department, access_level='EDIT')
+            )
+        return self.annotate(**flags)
+
+    def for_permission_check(self):
+        """Select the relations the can_* permission helpers compare against."""
+        return self.select_related('owner', 'created_by', 'bu_team', 'contract_type')
+
+    def for_detail(self, audit_log_limit=20):
+        """
+        Load everything the contract detail page shows. Child rows that
+        render a related object select it, cancelled approval requests are
+        left out, and the audit trail is capped at the latest
+        audit_log_limit entries, set as recent_audit_logs.
+        """
+        return self.select_related(
+            'owner', 'bu_team', 'contract_type', 'created_by', 'primary_file'
+        ).prefetch_related(
+            'files', 'clauses', 'risks', 'signatures',
+            models.Prefetch('approvals', queryset=AdditionalApproval.objects.select_related('approver').exclude(
+                status=AdditionalApproval.Status.CANCELLED
+            )),
+            models.Prefetch('deviations', queryset=Deviation.objects.select_related('clause')),
+            models.Prefetch('shares', queryset=ContractShare.objects.select_related(
+                'shared_with_user', 'shared_with_department'
+            )),
+            models.Prefetch(
+                'audit_logs',
+                queryset=AuditLog.objects.select_related('actor').order_by('-created_at')[:audit_log_limit],
+                to_attr='recent_audit_logs',
+            ),
+        )
+
+    def with_expiry_flags(self, days=30):
+        """
+        Annotate expired, expiring_soon and days_until_expiry, computed in
+        SQL against today's date. is_expired and is_expiring_soon read these
+        when present.
+        """
+        today = timezone.now().date()
+        return self.annotate(
+            expired=models.Case(
+                models.When(end_date__lt=today, then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            ),
+            expiring_soon=models.Case(
+                models.When(
+                    status=Contract.Status.ACTIVE,
+                    end_date__gt=today,
+                    end_date__lte=today + timedelta(days=days),
+                    then=models.Value(True),
+                ),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            ),
+            days_until_expiry=models.ExpressionWrapper(
+                models.F('end_date') - models.Value(today),
+                output_field=models.DurationField(),
+            ),
+        )
+
+    def list_values(self):
+        """
+        Rows for contract listings as plain dicts, with the owner and
+        department names joined and the expiry flags computed in SQL, so no
+        model instances are built.
+        """
+        return self.with_expiry_flags().values(
+            'pk', 'contract_number', 'title', 'status', 'customer_or_vendor_name',
+            'end_date', 'renewal_notice_date', 'owner__username', 'bu_team__name',
+            'expired', 'expiring_soon',
+        )
+
+    def bulk_create(self, objs, batch_size=500, **kwargs):
+        """
+        Bulk insert contracts, numbering any without a contract number first
+        as save() would. Every batch shares one INSERT statement shape.
+        """
+        objs = list(objs)
+        for contract in objs:
+            if not contract.contract_number:
+                contract.assign_contract_number()
+        created = super().bulk_create(objs, batch_size=batch_size, **kwargs)
+        # No save signals fire here, so the cached reports are dropped directly
+        _invalidate_contract_reports()
+        return created
+
+    def update(self, **kwargs):
+        """
+        Queryset updates send no save signals either, so any that change
+        rows drop the cached contract reports too.
+        """
+        rows = super().update(**kwargs)
+        if rows:
+            _invalidate_contract_reports()
+        return rows
+
+    def mark_expired(self):
+        """
+        Move active contracts whose end date has passed to EXPIRED in one
+        UPDATE, returning the number of contracts changed. Runs over the
+        contract_active_end_idx partial index and sends no save signals.
+        """
+        now = timezone.now()
+        return self.filter(
+            status=Contract.Status.ACTIVE,
+            end_date__lt=now.date(),
+        ).update(status=Contract.Status.EXPIRED, updated_at=now)
+
+
 class Contract(models.Model):
     """Main Contract model"""
     
+    # Choice fields below are stored as small integers to keep rows and the
+    # status indexes narrow; never renumber existing members
+
     # Status choices
-    class Status(models.TextChoices):
-        DRAFT = 'DRAFT', 'Draft'
-        PENDING = 'PENDING', 'Pending'
-        ACTIVE = 'ACTIVE', 'Active'
-        EXPIRED = 'EXPIRED', 'Expired'
-        TERMINATED = 'TERMINATED', 'Terminated'
-        ARCHIVED = 'ARCHIVED', 'Archived'
+    class Status(models.IntegerChoices):
+        DRAFT = 1, 'Draft'
+        PENDING = 2, 'Pending'
+        ACTIVE = 3, 'Active'
+        EXPIRED = 4, 'Expired'
+        TERMINATED = 5, 'Terminated'
+        ARCHIVED = 6, 'Archived'
+
+    # ISO 4217 codes
+    class Currency(models.TextChoices):
+        INR = 'INR', 'INR - Indian Rupee'
+        USD = 'USD', 'USD - US Dollar'
+        EUR = 'EUR', 'EUR - Euro'
+        GBP = 'GBP', 'GBP - British Pound'
+        AED = 'AED', 'AED - UAE Dirham'
+        SGD = 'SGD', 'SGD - Singapore Dollar'
 
     # Assignment status choices
-    class AssignmentStatus(models.TextChoices):
-        NOT_ASSIGNED = 'NOT_ASSIGNED', 'Not Assigned'
-        IN_PROGRESS = 'IN_PROGRESS', 'In Progress'
-        COMPLETED = 'COMPLETED', 'Completed'
+    class AssignmentStatus(models.IntegerChoices):
+        NOT_ASSIGNED = 1, 'Not Assigned'
+        IN_PROGRESS = 2, 'In Progress'
+        COMPLETED = 3, 'Completed'
 
     # Category choices (can be extended)
-    class Category(models.TextChoices):
-        SALES = 'SALES', 'Sales'
-        PROCUREMENT = 'PROCUREMENT', 'Procurement'
-        HR = 'HR', 'Human Resources'
-        LEGAL = 'LEGAL', 'Legal'
-        FINANCE = 'FINANCE', 'Finance'
-        PARTNERSHIP = 'PARTNERSHIP', 'Partnership'
-        NDA = 'NDA', 'Non-Disclosure Agreement'
-        SERVICE = 'SERVICE', 'Service Agreement'
-        OTHER = 'OTHER', 'Other'
-
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    class Category(models.IntegerChoices):
+        SALES = 1, 'Sales'
+        PROCUREMENT = 2, 'Procurement'
+        HR = 3, 'Human Resources'
+        LEGAL = 4, 'Legal'
+        FINANCE = 5, 'Finance'
+        PARTNERSHIP = 6, 'Partnership'
+        NDA = 7, 'Non-Disclosure Agreement'
+        SERVICE = 8, 'Service Agreement'
+        OTHER = 9, 'Other'
+
+    # Time-ordered so new rows append to the right edge of the pk and FK indexes
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     contract_number = models.CharField(max_length=50, blank=True, default='', db_index=True)
     title = models.CharField(max_length=500, db_index=True)
     
-    status = models.CharField(
-        max_length=20,
+    status = models.SmallIntegerField(
         choices=Status.choices,
-        default=Status.DRAFT,
-        db_index=True
+        default=Status.DRAFT
     )
     
-    category = models.CharField(
-        max_length=50,
+    category = models.SmallIntegerField(
         choices=Category.choices,
         default=Category.OTHER
     )
@@ -131,18 +318,17 @@ class Contract(models.Model):
         null=True,
         blank=True
     )
-    currency = models.CharField(max_length=8, blank=True, default='INR')
+    currency = models.CharField(max_length=3, choices=Currency.choices, default=Currency.INR)
     
     opportunity_id = models.CharField(max_length=100, blank=True, default='')
     
     effective_date = models.DateField(null=True, blank=True)
-    end_date = models.DateField(null=True, blank=True, db_index=True)
+    end_date = models.DateField(null=True, blank=True)
     
     auto_renewal = models.BooleanField(default=False)
     renewal_notice_date = models.DateField(null=True, blank=True)
     
-    assignment_status = models.CharField(
-        max_length=20,
+    assignment_status = models.SmallIntegerField(
         choices=AssignmentStatus.choices,
         default=AssignmentStatus.NOT_ASSIGNED
     )
@@ -156,8 +342,18 @@ class Contract(models.Model):
     
     is_confidential = models.BooleanField(default=False)
     
+    # Denormalized from ContractFile.is_primary, which keeps it in step
+    primary_file = models.ForeignKey(
+        'ContractFile',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+    
     # Flexible metadata storage
-    extra_metadata = models.JSONField(default=dict, blank=True)
+    extra_metadata = models.JSONField(default=dict, blank=True, encoder=OrjsonEncoder, decoder=OrjsonDecoder)
     
     # Tags (many-to-many)
     tags = models.ManyToManyField(Tag, through='ContractTag', related_name='contracts')
@@ -171,30 +367,71 @@ class Contract(models.Model):
         related_name='created_contracts'
     )
 
+    objects = ContractQuerySet.as_manager()
+
     class Meta:
         db_table = 'contracts_contract'
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['category', 'created_at']),
             models.Index(fields=['owner', 'status']),
             models.Index(fields=['end_date', 'status']),
+            # Expiring-contract lookups only ever look at active contracts
+            models.Index(
+                fields=['end_date'],
+                name='contract_active_end_idx',
+                condition=models.Q(status=3, end_date__isnull=False),  # Status.ACTIVE
+            ),
         ]
 
     def __str__(self):
         return f"{self.contract_number or 'No Number'} - {self.title}"
 
+    def assign_contract_number(self):
+        # The UUID pk is assigned on instantiation, so the number is known
+        # before the INSERT. The leading hex digits of a UUIDv7 are its
+        # timestamp, so the number takes the random tail.
+        if self.id is None:
+            self.id = uuid7()
+        self.contract_number = f"CNT-{timezone.now().strftime('%Y%m')}-{self.id.hex[-8:].upper()}"
+
     def save(self, *args, **kwargs):
         # Auto-generate contract number if not set
         if not self.contract_number:
-            super().save(*args, **kwargs)
-            self.contract_number = f"CNT-{timezone.now().strftime('%Y%m')}-{str(self.id)[:8].upper()}"
-            super().save(update_fields=['contract_number'])
-        else:
-            super().save(*args, **kwargs)
+            self.assign_contract_number()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'contract_number'}
+        if (not self._state.adding and not args and not kwargs.get('force_insert')
+                and kwargs.get('update_fields') is None):
+            # primary_file is written by ContractFile.save; a stale instance
+            # must not put back an outdated value, so leave it out
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'primary_file' and field.attname not in deferred
+            ]
+            try:
+                super().save(update_fields=update_fields, **kwargs)
+                return
+            except DatabaseError as exc:
+                # Only the "did not affect any rows" error is the bare class;
+                # driver errors arrive as its subclasses. It is raised by
+                # Django, not the database, so the transaction is still usable
+                if type(exc) is not DatabaseError:
+                    raise
+                if transaction.get_connection(kwargs.get('using')).in_atomic_block:
+                    transaction.set_rollback(False, using=kwargs.get('using'))
+            # The row was deleted under us, so a full save inserts it again
+            kwargs['force_insert'] = True
+        super().save(*args, **kwargs)
 
     @property
     def is_expiring_soon(self):
         """Check if contract expires within 30 days"""
+        if 'expiring_soon' in self.__dict__:
+            return self.expiring_soon
         if self.end_date and self.status == self.Status.ACTIVE:
             days_until_expiry = (self.end_date - timezone.now().date()).days
             return 0 < days_until_expiry <= 30
@@ -203,14 +440,22 @@ class Contract(models.Model):
     @property
     def is_expired(self):
         """Check if contract is past end date"""
+        if 'expired' in self.__dict__:
+            return self.expired
         if self.end_date:
             return self.end_date < timezone.now().date()
         return False
 
-    @property
-    def primary_file(self):
-        """Get the primary contract file"""
-        return self.files.filter(is_primary=True).first()
+    @cached_property
+    def tags_data(self):
+        """
+        Name and colour of each tag, ordered by name. Only the contract's tag
+        ids are queried; the rest comes from the cached tag table.
+        """
+        from .choice_cache import tag_table
+        tags = tag_table()
+        tag_ids = self.contracttag_set.values_list('tag_id', flat=True)
+        return sorted((tags[tag_id] for tag_id in tag_ids if tag_id in tags), key=itemgetter('name'))
 
 
 class ContractTag(models.Model):
@@ -258,17 +503,58 @@ class ContractFile(models.Model):
     class Meta:
         db_table = 'contracts_contract_file'
         ordering = ['-is_primary', '-uploaded_at']
+        indexes = [
+            models.Index(fields=['uploaded_at']),
+            models.Index(fields=['contract', 'is_primary'], name='cf_contract_primary_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['contract'],
+                condition=models.Q(is_primary=True),
+                name='one_primary_per_contract',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.original_filename} ({self.contract.title})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored flag so save() only demotes siblings when the
+        # file becomes primary
+        instance._loaded_is_primary = instance.__dict__.get('is_primary')
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None or 'is_primary' in fields:
+            self._loaded_is_primary = self.is_primary
+
     def save(self, *args, **kwargs):
-        # Ensure only one primary file per contract
-        if self.is_primary:
-            ContractFile.objects.filter(
-                contract=self.contract, is_primary=True
-            ).exclude(pk=self.pk).update(is_primary=False)
-        super().save(*args, **kwargs)
+        # Ensure only one primary file per contract and keep
+        # Contract.primary_file in step; the one_primary_per_contract
+        # constraint rejects a stale instance that would break this
+        was_primary = not self._state.adding and getattr(self, '_loaded_is_primary', None) is True
+        if self.is_primary == was_primary:
+            super().save(*args, **kwargs)
+        elif self.is_primary:
+            with transaction.atomic(using=kwargs.get('using')):
+                ContractFile.objects.filter(
+                    contract_id=self.contract_id, is_primary=True
+                ).exclude(pk=self.pk).update(is_primary=False)
+                super().save(*args, **kwargs)
+                Contract.objects.filter(pk=self.contract_id).update(primary_file=self)
+        else:
+            with transaction.atomic(using=kwargs.get('using')):
+                super().save(*args, **kwargs)
+                Contract.objects.filter(pk=self.contract_id, primary_file=self).update(primary_file=None)
+        if ContractFile.contract.is_cached(self):
+            if self.is_primary:
+                self.contract.primary_file = self
+            elif self.contract.primary_file_id == self.pk:
+                self.contract.primary_file = None
+        self._loaded_is_primary = self.is_primary
 
 
 class ContractVersion(models.Model):
@@ -298,6 +584,9 @@ class ContractVersion(models.Model):
         db_table = 'contracts_contract_version'
         ordering = ['-version_number']
         unique_together = ['contract', 'version_number']
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
 
     def __str__(self):
         return f"v{self.version_number} - {self.label}"
@@ -400,6 +689,9 @@ class AdditionalApproval(models.Model):
     class Meta:
         db_table = 'contracts_additional_approval'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
 
     def __str__(self):
         return f"Approval for {self.contract.title} - {self.status}"
@@ -636,28 +928,30 @@ class SignatureRecord(models.Model):
 class AuditLog(models.Model):
     """Audit trail for contract actions"""
     
-    class Action(models.TextChoices):
-        CREATE_CONTRACT = 'CREATE_CONTRACT', 'Contract Created'
-        UPDATE_CONTRACT = 'UPDATE_CONTRACT', 'Contract Updated'
-        DELETE_CONTRACT = 'DELETE_CONTRACT', 'Contract Deleted'
-        CHANGE_STATUS = 'CHANGE_STATUS', 'Status Changed'
-        ADD_FILE = 'ADD_FILE', 'File Added'
-        REMOVE_FILE = 'REMOVE_FILE', 'File Removed'
-        ADD_VERSION = 'ADD_VERSION', 'Version Added'
-        CREATE_APPROVAL = 'CREATE_APPROVAL', 'Approval Requested'
-        APPROVE = 'APPROVE', 'Approved'
-        REJECT = 'REJECT', 'Rejected'
-        CANCEL_APPROVAL = 'CANCEL_APPROVAL', 'Approval Cancelled'
-        SHARE = 'SHARE', 'Contract Shared'
-        UNSHARE = 'UNSHARE', 'Share Removed'
-        ADD_CLAUSE = 'ADD_CLAUSE', 'Clause Added'
-        UPDATE_CLAUSE = 'UPDATE_CLAUSE', 'Clause Updated'
-        ADD_DEVIATION = 'ADD_DEVIATION', 'Deviation Added'
-        ADD_RISK = 'ADD_RISK', 'Risk Added'
-        ADD_SIGNATURE = 'ADD_SIGNATURE', 'Signature Added'
-        SIGN = 'SIGN', 'Document Signed'
-        VIEW = 'VIEW', 'Contract Viewed'
-        DOWNLOAD = 'DOWNLOAD', 'File Downloaded'
+    # Stored as small integers to keep the audit indexes narrow; never
+    # renumber existing members
+    class Action(models.IntegerChoices):
+        CREATE_CONTRACT = 1, 'Contract Created'
+        UPDATE_CONTRACT = 2, 'Contract Updated'
+        DELETE_CONTRACT = 3, 'Contract Deleted'
+        CHANGE_STATUS = 4, 'Status Changed'
+        ADD_FILE = 5, 'File Added'
+        REMOVE_FILE = 6, 'File Removed'
+        ADD_VERSION = 7, 'Version Added'
+        CREATE_APPROVAL = 8, 'Approval Requested'
+        APPROVE = 9, 'Approved'
+        REJECT = 10, 'Rejected'
+        CANCEL_APPROVAL = 11, 'Approval Cancelled'
+        SHARE = 12, 'Contract Shared'
+        UNSHARE = 13, 'Share Removed'
+        ADD_CLAUSE = 14, 'Clause Added'
+        UPDATE_CLAUSE = 15, 'Clause Updated'
+        ADD_DEVIATION = 16, 'Deviation Added'
+        ADD_RISK = 17, 'Risk Added'
+        ADD_SIGNATURE = 18, 'Signature Added'
+        SIGN = 19, 'Document Signed'
+        VIEW = 20, 'Contract Viewed'
+        DOWNLOAD = 21, 'File Downloaded'
 
     id = models.AutoField(primary_key=True)
     contract = models.ForeignKey(
@@ -667,13 +961,13 @@ class AuditLog(models.Model):
         blank=True,
         related_name='audit_logs'
     )
-    action = models.CharField(max_length=50, choices=Action.choices, db_index=True)
+    action = models.SmallIntegerField(choices=Action.choices, db_index=True)
     actor = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
         null=True
     )
-    metadata = models.JSONField(default=dict, blank=True)
+    metadata = models.JSONField(default=dict, blank=True, encoder=OrjsonEncoder, decoder=OrjsonDecoder)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
@@ -685,6 +979,39 @@ class AuditLog(models.Model):
             models.Index(fields=['contract', 'action', 'created_at']),
         ]
 
+    EXPORT_FIELDS = (
+        'id', 'created_at', 'action', 'contract__contract_number',
+        'actor__username', 'ip_address', 'user_agent', 'metadata',
+    )
+
     def __str__(self):
-        return f"{self.action} by {self.actor} at {self.created_at}"
+        return f"{self.get_action_display()} by {self.actor} at {self.created_at}"
+
+    @classmethod
+    def bulk_log(cls, entries):
+        """Insert unsaved audit log entries in batched INSERTs"""
+        if len(entries) == 1:
+            # A lone entry skips the transaction bulk_create opens
+            entries[0].save()
+            return entries
+        return cls.objects.bulk_create(entries, batch_size=500)
+
+    @classmethod
+    async def abulk_log(cls, entries):
+        """Async version of bulk_log"""
+        if len(entries) == 1:
+            await entries[0].asave()
+            return entries
+        return await cls.objects.abulk_create(entries, batch_size=500)
+
+    @classmethod
+    def export_iter(cls, **filters):
+        """
+        Yield matching entries as dicts of EXPORT_FIELDS, oldest first. Rows
+        are streamed in chunks (a server-side cursor on PostgreSQL), so long
+        exports run in bounded memory.
+        """
+        return cls.objects.filter(**filters).order_by('created_at', 'id').values(
+            *cls.EXPORT_FIELDS
+        ).iterator(chunk_size=2000)
 
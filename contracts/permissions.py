@@ -11,10 +11,14 @@ Adapt user.role or user.groups mapping as needed for your Pulse setup.
 """
 
 from functools import wraps
+from django.core.cache import cache
+from django.db.models import Q
 from django.http import HttpResponseForbidden
 from django.shortcuts import redirect
 from django.contrib import messages
 
+from .models import AdditionalApproval, Contract, ContractShare
+
 
 # Role constants
 class Roles:
@@ -26,6 +30,18 @@ class Roles:
     ALL_ROLES = [LEGAL_ADMIN, LEGAL_USER, FINANCE_VIEWER, USER]
 
 
+# Group names that grant a role; a user in several gets the highest
+GROUP_ROLES = {
+    'Legal Admin': Roles.LEGAL_ADMIN,
+    'legal_admin': Roles.LEGAL_ADMIN,
+    'Legal User': Roles.LEGAL_USER,
+    'legal_user': Roles.LEGAL_USER,
+    'Finance Viewer': Roles.FINANCE_VIEWER,
+    'finance_viewer': Roles.FINANCE_VIEWER,
+}
+GROUP_ROLE_PRIORITY = (Roles.LEGAL_ADMIN, Roles.LEGAL_USER, Roles.FINANCE_VIEWER)
+
+
 def get_user_role(user):
     """
     Get the user's role for contract management.
@@ -40,6 +56,34 @@ def get_user_role(user):
     if not user or not user.is_authenticated:
         return None
     
+    # The user object lives for one request, so the role is worked out once
+    # and kept on it; across requests it is shared through the Django cache
+    role = getattr(user, '_contract_role_cache', None)
+    if role is None:
+        key = _role_cache_key(user.pk)
+        role = cache.get(key)
+        if role is None:
+            role = _resolve_user_role(user)
+            cache.set(key, role, ROLE_CACHE_TIMEOUT)
+        user._contract_role_cache = role
+    return role
+
+
+# Seconds a resolved role is shared between requests. signals.py drops it
+# early when the user or their groups change.
+ROLE_CACHE_TIMEOUT = 30
+
+
+def _role_cache_key(user_pk):
+    return f'contracts:user_role:{user_pk}'
+
+
+def invalidate_user_roles(user_pks):
+    """Forget the cached roles of the given users"""
+    cache.delete_many([_role_cache_key(pk) for pk in user_pks])
+
+
+def _resolve_user_role(user):
     # Check if user is superuser or staff - treat as LEGAL_ADMIN
     if user.is_superuser:
         return Roles.LEGAL_ADMIN
@@ -50,13 +94,14 @@ def get_user_role(user):
     
     # Option 2: Check user groups
     if hasattr(user, 'groups'):
-        group_names = user.groups.values_list('name', flat=True)
-        if 'Legal Admin' in group_names or 'legal_admin' in group_names:
-            return Roles.LEGAL_ADMIN
-        elif 'Legal User' in group_names or 'legal_user' in group_names:
-            return Roles.LEGAL_USER
-        elif 'Finance Viewer' in group_names or 'finance_viewer' in group_names:
-            return Roles.FINANCE_VIEWER
+        if 'groups' in getattr(user, '_prefetched_objects_cache', {}):
+            group_names = {group.name for group in user.groups.all()}
+        else:
+            group_names = set(user.groups.values_list('name', flat=True))
+        group_roles = {GROUP_ROLES[name] for name in group_names if name in GROUP_ROLES}
+        for role in GROUP_ROLE_PRIORITY:
+            if role in group_roles:
+                return role
     
     # Option 3: Check staff status - treat staff as LEGAL_USER
     if user.is_staff:
@@ -66,20 +111,28 @@ def get_user_role(user):
     return Roles.USER
 
 
+def _role(user):
+    # The role checks run many times per request; once the role is cached
+    # on the user they are a single attribute read
+    role = getattr(user, '_contract_role_cache', None)
+    if role is None:
+        role = get_user_role(user)
+    return role
+
+
 def is_legal_admin(user):
     """Check if user has LEGAL_ADMIN role"""
-    return get_user_role(user) == Roles.LEGAL_ADMIN
+    return _role(user) == Roles.LEGAL_ADMIN
 
 
 def is_legal_user(user):
     """Check if user has LEGAL_USER role or higher"""
-    role = get_user_role(user)
-    return role in [Roles.LEGAL_ADMIN, Roles.LEGAL_USER]
+    return _role(user) in (Roles.LEGAL_ADMIN, Roles.LEGAL_USER)
 
 
 def is_finance_viewer(user):
     """Check if user has FINANCE_VIEWER role"""
-    return get_user_role(user) == Roles.FINANCE_VIEWER
+    return _role(user) == Roles.FINANCE_VIEWER
 
 
 def can_admin_contracts(user):
@@ -121,9 +174,11 @@ def can_view_contract(user, contract):
     if contract.owner == user or contract.created_by == user:
         return True
     
-    # Check direct shares
-    from .models import ContractShare
-    if ContractShare.objects.filter(
+    # Check direct shares, from ContractQuerySet.with_share_flags when present
+    if 'has_user_share' in contract.__dict__:
+        if contract.has_user_share:
+            return True
+    elif ContractShare.objects.filter(
         contract=contract,
         shared_with_user=user
     ).exists():
@@ -131,7 +186,10 @@ def can_view_contract(user, contract):
     
     # Check department shares
     if hasattr(user, 'department') and user.department:
-        if ContractShare.objects.filter(
+        if 'has_dept_share' in contract.__dict__:
+            if contract.has_dept_share:
+                return True
+        elif ContractShare.objects.filter(
             contract=contract,
             shared_with_department=user.department
         ).exists():
@@ -148,9 +206,7 @@ def can_view_contract(user, contract):
     
     # LEGAL_USER can see contracts they have approvals for
     if is_legal_user(user):
-        if contract.approvals.filter(approver=user).exists():
-            return True
-        if contract.approvals.filter(requested_by=user).exists():
+        if contract.approvals.filter(Q(approver=user) | Q(requested_by=user)).exists():
             return True
     
     return False
@@ -177,9 +233,11 @@ def can_edit_contract(user, contract):
     if contract.owner == user:
         return True
     
-    # Check for EDIT shares
-    from .models import ContractShare
-    if ContractShare.objects.filter(
+    # Check for EDIT shares, from ContractQuerySet.with_share_flags when present
+    if 'has_user_edit_share' in contract.__dict__:
+        if contract.has_user_edit_share:
+            return True
+    elif ContractShare.objects.filter(
         contract=contract,
         shared_with_user=user,
         access_level='EDIT'
@@ -188,7 +246,10 @@ def can_edit_contract(user, contract):
     
     # Check department EDIT shares
     if hasattr(user, 'department') and user.department:
-        if ContractShare.objects.filter(
+        if 'has_dept_edit_share' in contract.__dict__:
+            if contract.has_dept_edit_share:
+                return True
+        elif ContractShare.objects.filter(
             contract=contract,
             shared_with_department=user.department,
             access_level='EDIT'
@@ -210,7 +271,7 @@ def can_delete_contract(user, contract):
         return True
     
     # Owner can delete only DRAFT contracts
-    if contract.owner == user and contract.status == 'DRAFT':
+    if contract.owner == user and contract.status == Contract.Status.DRAFT:
         return True
     
     return False
@@ -319,6 +380,14 @@ def can_share_contract(user, contract):
 
 # Decorators for view protection
 
+def fetch_contract_for_permission(pk):
+    """
+    Get a contract ready for the can_* helpers, with the owner, creator,
+    BU/Team and type loaded in the same query. Raises Contract.DoesNotExist.
+    """
+    return Contract.objects.for_permission_check().get(pk=pk)
+
+
 def contract_permission_required(permission_func):
     """
     Decorator for views that require contract-specific permission.
@@ -327,14 +396,12 @@ def contract_permission_required(permission_func):
     def decorator(view_func):
         @wraps(view_func)
         def _wrapped_view(request, *args, **kwargs):
-            from .models import Contract
-            
             pk = kwargs.get('pk')
             if not pk:
                 return HttpResponseForbidden("Contract ID required")
             
             try:
-                contract = Contract.objects.get(pk=pk)
+                contract = fetch_contract_for_permission(pk)
             except Contract.DoesNotExist:
                 return HttpResponseForbidden("Contract not found")
             
@@ -373,34 +440,178 @@ def legal_user_required(view_func):
 
 
 # Template context processor helper
+# Role-level template flags, worked out once per role rather than per render.
+# They mirror is_legal_admin, is_legal_user, is_finance_viewer,
+# can_admin_contracts and can_create_contract.
+ROLE_FLAGS = {
+    role: {
+        'is_legal_admin': role == Roles.LEGAL_ADMIN,
+        'is_legal_user': role in (Roles.LEGAL_ADMIN, Roles.LEGAL_USER),
+        'is_finance_viewer': role == Roles.FINANCE_VIEWER,
+        'can_admin_contracts': role == Roles.LEGAL_ADMIN,
+        'can_create_contract': role in (Roles.LEGAL_ADMIN, Roles.LEGAL_USER),
+    }
+    for role in Roles.ALL_ROLES
+}
+NO_ROLE_FLAGS = dict.fromkeys(ROLE_FLAGS[Roles.USER], False)
+
+
 def get_user_permissions_context(user, contract=None):
     """
     Get a dictionary of user permissions for use in templates.
     """
-    context = {
-        'is_legal_admin': is_legal_admin(user),
-        'is_legal_user': is_legal_user(user),
-        'is_finance_viewer': is_finance_viewer(user),
-        'can_admin_contracts': can_admin_contracts(user),
-        'can_create_contract': can_create_contract(user),
-        'user_role': get_user_role(user),
-    }
+    role = _role(user)
+    context = dict(ROLE_FLAGS.get(role, NO_ROLE_FLAGS), user_role=role)
     
     if contract:
-        context.update({
-            'can_view_contract': can_view_contract(user, contract),
-            'can_edit_contract': can_edit_contract(user, contract),
-            'can_delete_contract': can_delete_contract(user, contract),
-            'can_manage_approvals': can_manage_approvals(user, contract),
-            'can_upload_files': can_upload_files(user, contract),
-            'can_add_version': can_add_version(user, contract),
-            'can_change_status': can_change_status(user, contract),
-            'can_manage_clauses': can_manage_clauses(user, contract),
-            'can_manage_risks': can_manage_risks(user, contract),
-            'can_manage_deviations': can_manage_deviations(user, contract),
-            'can_manage_signatures': can_manage_signatures(user, contract),
-            'can_share_contract': can_share_contract(user, contract),
-        })
+        context.update(_contract_permissions(user, contract))
     
     return context
 
+
+# Flags _contract_permissions adds to the template context
+CONTRACT_PERMISSION_KEYS = (
+    'can_view_contract', 'can_edit_contract', 'can_delete_contract',
+    'can_manage_approvals', 'can_upload_files', 'can_add_version',
+    'can_change_status', 'can_manage_clauses', 'can_manage_risks',
+    'can_manage_deviations', 'can_manage_signatures', 'can_share_contract',
+)
+
+
+def _collect_contract_facts(user, contract, access_levels=None, approval_party=None):
+    """
+    The facts the contract can_* helpers decide on, gathered with one share
+    query (and one approval query only when nothing else grants viewing).
+    Callers that looked the shares or approvals up in bulk pass them in.
+    """
+    department = getattr(user, 'department', None)
+    facts = {
+        'is_admin': is_legal_admin(user),
+        'is_owner': contract.owner_id == user.pk,
+        'is_creator': contract.created_by_id == user.pk,
+        'is_draft': contract.status == Contract.Status.DRAFT,
+        'same_department': bool(department and contract.bu_team_id == department.pk),
+        'finance_visible': is_finance_viewer(user) and not contract.is_confidential,
+        'any_share': False,
+        'edit_share': False,
+        'approval_party': False,
+    }
+    if facts['is_admin']:
+        return facts
+    
+    if access_levels is None:
+        access_levels = set(
+            ContractShare.objects.filter(_share_q(user), contract=contract).values_list('access_level', flat=True)
+        )
+    facts['any_share'] = bool(access_levels)
+    facts['edit_share'] = 'EDIT' in access_levels
+    
+    visible = (
+        facts['is_owner'] or facts['is_creator'] or facts['any_share']
+        or facts['same_department'] or facts['finance_visible']
+    )
+    if approval_party is not None:
+        facts['approval_party'] = approval_party
+    elif not visible and is_legal_user(user):
+        facts['approval_party'] = contract.approvals.filter(
+            Q(approver=user) | Q(requested_by=user)
+        ).exists()
+    return facts
+
+
+def _share_q(user):
+    # Shares with the user or with the user's department
+    share_q = Q(shared_with_user=user)
+    department = getattr(user, 'department', None)
+    if department:
+        share_q |= Q(shared_with_department=department)
+    return share_q
+
+
+def _annotated_access_levels(contract):
+    """Share access levels from ContractQuerySet.with_share_flags, or None"""
+    if 'has_user_share' not in contract.__dict__:
+        return None
+    if contract.has_user_edit_share or getattr(contract, 'has_dept_edit_share', False):
+        return {'EDIT'}
+    if contract.has_user_share or getattr(contract, 'has_dept_share', False):
+        return {'VIEW'}
+    return set()
+
+
+def _contract_permissions(user, contract):
+    """Every contract permission flag, derived from one set of facts"""
+    if not user or not user.is_authenticated:
+        return dict.fromkeys(CONTRACT_PERMISSION_KEYS, False)
+    
+    return _permissions_from_facts(_collect_contract_facts(user, contract))
+
+
+def _permissions_from_facts(facts):
+    admin = facts['is_admin']
+    can_edit = admin or facts['is_owner'] or facts['edit_share']
+    can_view = admin or facts['is_owner'] or facts['is_creator'] or facts['any_share'] or (
+        facts['same_department'] or facts['finance_visible'] or facts['approval_party']
+    )
+    return {
+        'can_view_contract': can_view,
+        'can_edit_contract': can_edit,
+        'can_delete_contract': admin or (facts['is_owner'] and facts['is_draft']),
+        'can_manage_approvals': can_edit,
+        'can_upload_files': can_edit,
+        'can_add_version': can_edit,
+        'can_change_status': can_edit,
+        'can_manage_clauses': can_edit,
+        'can_manage_risks': can_edit,
+        'can_manage_deviations': can_edit,
+        'can_manage_signatures': can_edit,
+        'can_share_contract': admin or facts['is_owner'],
+    }
+
+
+def prefetch_contract_permissions(user, contracts):
+    """
+    Work out the permission flags of a page of contracts with one share query
+    (plus one approval query for legal users) and keep them on each contract,
+    so the per-row permission template tags need no queries. Contracts loaded
+    with ContractQuerySet.with_share_flags skip the share query.
+    
+    Returns the contracts as a list; read a flag with contract_permission().
+    """
+    contracts = list(contracts)
+    if not user or not user.is_authenticated:
+        for contract in contracts:
+            contract._permission_flags = (None, dict.fromkeys(CONTRACT_PERMISSION_KEYS, False))
+        return contracts
+    
+    access_levels = {contract.pk: _annotated_access_levels(contract) for contract in contracts}
+    approval_ids = set()
+    if contracts and not is_legal_admin(user):
+        unflagged = [pk for pk, levels in access_levels.items() if levels is None]
+        if unflagged:
+            access_levels.update((pk, set()) for pk in unflagged)
+            shares = ContractShare.objects.filter(_share_q(user), contract__in=unflagged)
+            for contract_id, access_level in shares.values_list('contract_id', 'access_level'):
+                access_levels[contract_id].add(access_level)
+        if is_legal_user(user):
+            approval_ids = set(AdditionalApproval.objects.filter(
+                Q(approver=user) | Q(requested_by=user), contract__in=contracts
+            ).values_list('contract_id', flat=True))
+    
+    for contract in contracts:
+        facts = _collect_contract_facts(
+            user, contract, access_levels[contract.pk], contract.pk in approval_ids
+        )
+        contract._permission_flags = (user.pk, _permissions_from_facts(facts))
+    return contracts
+
+
+def contract_permission(user, contract, key):
+    """
+    A flag from prefetch_contract_permissions for this user, or None when the
+    contract carries no flags for them.
+    """
+    cached = getattr(contract, '_permission_flags', None)
+    if cached is not None and cached[0] == getattr(user, 'pk', None):
+        return cached[1][key]
+    return None
@@ -3,18 +3,22 @@ Business logic and service functions for Contract Management module.
 Includes dashboard metrics, query helpers, and contract operations.
 """
 
+from collections import Counter
 from datetime import timedelta
 from decimal import Decimal
-from django.db import models
-from django.db.models import Count, Q, Sum, F
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connections, models, transaction
+from django.db.models import Count, Max, Q, Sum, F, Window
 from django.db.models.functions import TruncMonth
+from django.core.cache import cache
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
+from . import choice_cache
 from .models import (
     Contract, ContractFile, ContractVersion, ContractShare,
     AdditionalApproval, Clause, Deviation, RiskItem, AuditLog,
-    Department, ContractType, Tag
+    Department, ContractType, Tag, ContractTag
 )
 from .permissions import (
     is_legal_admin, is_legal_user, is_finance_viewer,
@@ -23,6 +27,61 @@ from .permissions import (
 
 User = get_user_model()
 
+# Matches the contract_search_gin expression index (migration 0002); used
+# for contract search on PostgreSQL
+CONTRACT_SEARCH_VECTOR = SearchVector(
+    'title', 'customer_or_vendor_name', 'contract_number', config='english'
+)
+
+
+def contract_search_query(search):
+    return SearchQuery(search, config='english', search_type='websearch')
+
+
+def accessible_contract_ids(user):
+    """
+    Ids of the contracts the user can access, as a UNION of small lookups
+    that each use their own index. The UNION removes duplicates, so callers
+    filter with pk__in and need no join or distinct().
+
+    The subquery is built once per request and kept on the user object. It
+    stays lazy, so each query that uses it sees current shares and approvals.
+    """
+    cached = getattr(user, '_contract_accessible_ids', None)
+    if cached is not None:
+        return cached
+    
+    department = getattr(user, 'department', None)
+    
+    # User owns or created
+    contract_q = Q(owner=user) | Q(created_by=user)
+    
+    # In the user's department
+    if department:
+        contract_q |= Q(bu_team=department)
+    
+    # Finance viewers can see non-confidential
+    if is_finance_viewer(user):
+        contract_q |= Q(is_confidential=False)
+    
+    # Shared directly with user or with user's department
+    arms = [ContractShare.objects.filter(shared_with_user=user).order_by().values('contract_id')]
+    if department:
+        arms.append(
+            ContractShare.objects.filter(shared_with_department=department).order_by().values('contract_id')
+        )
+    
+    # Legal users can see contracts they have approvals for
+    if is_legal_user(user):
+        arms.append(AdditionalApproval.objects.filter(
+            Q(approver=user) | Q(requested_by=user)
+        ).order_by().values('contract_id'))
+    
+    # Default model orderings are cleared; a compound query can't order its arms
+    accessible_ids = Contract.objects.filter(contract_q).order_by().values('pk').union(*arms)
+    user._contract_accessible_ids = accessible_ids
+    return accessible_ids
+
 
 # ============================================================================
 # Dashboard Metrics Service
@@ -33,6 +92,8 @@ class DashboardService:
     
     def __init__(self, user):
         self.user = user
+        # Checked by nearly every metric; resolved once per service
+        self.is_admin = is_legal_admin(user)
         self.today = timezone.now().date()
     
     def get_all_metrics(self):
@@ -55,12 +116,9 @@ class DashboardService:
         contracts = Contract.objects.filter(
             owner=self.user,
             status__in=[Contract.Status.DRAFT, Contract.Status.PENDING]
-        ).order_by('-updated_at')[:10]
+        ).order_by('-updated_at').list_values()
         
-        return {
-            'count': contracts.count(),
-            'items': list(contracts),
-        }
+        return self._count_and_items(contracts)
     
     def get_pending_approvals(self):
         """
@@ -69,12 +127,9 @@ class DashboardService:
         approvals = AdditionalApproval.objects.filter(
             approver=self.user,
             status=AdditionalApproval.Status.PENDING
-        ).select_related('contract', 'requested_by').order_by('-created_at')[:10]
+        ).select_related('contract', 'requested_by').order_by('-created_at')
         
-        return {
-            'count': approvals.count(),
-            'items': list(approvals),
-        }
+        return self._count_and_items(approvals)
     
     def get_expiring_contracts(self, days=30):
         """
@@ -91,15 +146,10 @@ class DashboardService:
         )
         
         # Filter based on user access
-        if not is_legal_admin(self.user):
+        if not self.is_admin:
             queryset = self._filter_user_accessible_contracts(queryset)
         
-        contracts = queryset.order_by('end_date')[:10]
-        
-        return {
-            'count': queryset.count(),
-            'items': list(contracts),
-        }
+        return self._count_and_items(queryset.order_by('end_date').list_values())
     
     def get_notified_contracts(self):
         """
@@ -115,15 +165,10 @@ class DashboardService:
             renewal_notice_date__gte=self.today
         )
         
-        if not is_legal_admin(self.user):
+        if not self.is_admin:
             queryset = self._filter_user_accessible_contracts(queryset)
         
-        contracts = queryset.order_by('renewal_notice_date')[:10]
-        
-        return {
-            'count': queryset.count(),
-            'items': list(contracts),
-        }
+        return self._count_and_items(queryset.order_by('renewal_notice_date').list_values())
     
     def get_contract_stats(self):
         """
@@ -131,25 +176,19 @@ class DashboardService:
         """
         queryset = Contract.objects.all()
         
-        if not is_legal_admin(self.user):
+        if not self.is_admin:
             queryset = self._filter_user_accessible_contracts(queryset)
         
-        stats = queryset.values('status').annotate(
-            count=Count('id')
-        ).order_by('status')
-        
-        # Convert to dict for easy access
-        status_counts = {item['status']: item['count'] for item in stats}
-        
-        return {
-            'draft': status_counts.get(Contract.Status.DRAFT, 0),
-            'pending': status_counts.get(Contract.Status.PENDING, 0),
-            'active': status_counts.get(Contract.Status.ACTIVE, 0),
-            'expired': status_counts.get(Contract.Status.EXPIRED, 0),
-            'terminated': status_counts.get(Contract.Status.TERMINATED, 0),
-            'archived': status_counts.get(Contract.Status.ARCHIVED, 0),
-            'total': sum(status_counts.values()),
-        }
+        # One pass with a conditional count per status, rather than GROUP BY
+        return queryset.aggregate(
+            draft=Count('id', filter=Q(status=Contract.Status.DRAFT)),
+            pending=Count('id', filter=Q(status=Contract.Status.PENDING)),
+            active=Count('id', filter=Q(status=Contract.Status.ACTIVE)),
+            expired=Count('id', filter=Q(status=Contract.Status.EXPIRED)),
+            terminated=Count('id', filter=Q(status=Contract.Status.TERMINATED)),
+            archived=Count('id', filter=Q(status=Contract.Status.ARCHIVED)),
+            total=Count('id'),
+        )
     
     def get_quick_stats(self):
         """
@@ -157,7 +196,7 @@ class DashboardService:
         """
         queryset = Contract.objects.all()
         
-        if not is_legal_admin(self.user):
+        if not self.is_admin:
             queryset = self._filter_user_accessible_contracts(queryset)
         
         # Total value of active contracts
@@ -189,47 +228,45 @@ class DashboardService:
         """
         Get recent audit log entries for contracts user can access.
         """
-        queryset = AuditLog.objects.select_related('contract', 'actor')
+        queryset = AuditLog.objects.all()
         
-        if not is_legal_admin(self.user):
-            accessible_contracts = self._filter_user_accessible_contracts(
-                Contract.objects.all()
-            )
+        if not self.is_admin:
             queryset = queryset.filter(
-                Q(contract__in=accessible_contracts) |
+                Q(contract__in=accessible_contract_ids(self.user)) |
                 Q(actor=self.user)
             )
         
-        return list(queryset.order_by('-created_at')[:limit])
+        # Only the columns the activity feed shows, as plain rows
+        rows = list(queryset.order_by('-created_at').values(
+            'id', 'action', 'created_at', 'actor__username', 'contract_id', 'contract__title'
+        )[:limit])
+        labels = dict(AuditLog.Action.choices)
+        for row in rows:
+            row['label'] = labels.get(row['action'], row['action'])
+        return rows
+    
+    def _count_and_items(self, queryset, limit=10):
+        """
+        Return the first `limit` rows and the total count in one query; each
+        row carries the full match count from a COUNT(*) OVER () window.
+        """
+        items = list(queryset.annotate(total=Window(Count('*')))[:limit])
+        if not items:
+            count = 0
+        elif isinstance(items[0], dict):
+            count = items[0]['total']
+        else:
+            count = items[0].total
+        return {
+            'count': count,
+            'items': items,
+        }
     
     def _filter_user_accessible_contracts(self, queryset):
         """
         Filter queryset to only include contracts the user can access.
         """
-        # User owns or created
-        user_contracts = Q(owner=self.user) | Q(created_by=self.user)
-        
-        # Shared directly with user
-        shared_with_user = Q(shares__shared_with_user=self.user)
-        
-        # Build the filter
-        filter_q = user_contracts | shared_with_user
-        
-        # Shared with user's department
-        if hasattr(self.user, 'department') and self.user.department:
-            filter_q |= Q(shares__shared_with_department=self.user.department)
-            filter_q |= Q(bu_team=self.user.department)
-        
-        # Finance viewers can see non-confidential
-        if is_finance_viewer(self.user):
-            filter_q |= Q(is_confidential=False)
-        
-        # Legal users can see contracts they have approvals for
-        if is_legal_user(self.user):
-            filter_q |= Q(approvals__approver=self.user)
-            filter_q |= Q(approvals__requested_by=self.user)
-        
-        return queryset.filter(filter_q).distinct()
+        return queryset.filter(pk__in=accessible_contract_ids(self.user))
 
 
 # ============================================================================
@@ -241,6 +278,7 @@ class ContractQueryService:
     
     def __init__(self, user):
         self.user = user
+        self.is_admin = is_legal_admin(user)
     
     def get_contracts_for_tab(self, tab, filters=None):
         """
@@ -257,16 +295,19 @@ class ContractQueryService:
         if tab == 'draft':
             queryset = queryset.filter(status=Contract.Status.DRAFT)
         elif tab == 'pending':
-            queryset = queryset.filter(
-                Q(status=Contract.Status.PENDING) |
-                Q(approvals__status=AdditionalApproval.Status.PENDING)
-            ).distinct()
+            # A UNION of ids rather than a join on approvals, which would
+            # fan out and need distinct()
+            pending_ids = Contract.objects.filter(
+                status=Contract.Status.PENDING
+            ).order_by().values('pk').union(
+                AdditionalApproval.objects.filter(
+                    status=AdditionalApproval.Status.PENDING
+                ).order_by().values('contract_id')
+            )
+            queryset = queryset.filter(pk__in=pending_ids)
         elif tab == 'repository':
             queryset = queryset.exclude(
                 status__in=[Contract.Status.DRAFT, Contract.Status.PENDING]
-            ).exclude(
-                Q(status=Contract.Status.DRAFT) &
-                Q(approvals__status=AdditionalApproval.Status.PENDING)
             )
         
         if filters:
@@ -276,23 +317,43 @@ class ContractQueryService:
     
     def _get_base_queryset(self):
         """Get base queryset filtered by user access"""
-        queryset = Contract.objects.select_related(
-            'owner', 'bu_team', 'contract_type', 'created_by'
-        ).prefetch_related('tags')
+        queryset = Contract.objects.with_related()
         
-        if not is_legal_admin(self.user):
-            dashboard_service = DashboardService(self.user)
-            queryset = dashboard_service._filter_user_accessible_contracts(queryset)
+        if not self.is_admin:
+            queryset = queryset.filter(
+                pk__in=accessible_contract_ids(self.user)
+            ).with_share_flags(self.user)
         
         return queryset
     
     def _apply_filters(self, queryset, filters):
         """Apply filters to queryset"""
+        full_text = bool(filters.get('search')) and connections[queryset.db].vendor == 'postgresql'
+        if full_text:
+            queryset = queryset.alias(search_document=CONTRACT_SEARCH_VECTOR)
+        return queryset.filter(self.build_filter_q(filters, full_text=full_text))
+    
+    @staticmethod
+    def build_filter_q(filters, full_text=False):
+        """
+        Compile list filters into a single Q object.
+        
+        Accepts the cleaned data of ContractFilterForm; empty values are
+        ignored. With full_text, search matches against a search_document
+        alias of CONTRACT_SEARCH_VECTOR, which the queryset must provide, or
+        a partial contract number (contract_number_trgm index, migration 0016).
+        """
+        q = Q()
         
         # Search filter
         search = filters.get('search')
-        if search:
-            queryset = queryset.filter(
+        if search and full_text:
+            q &= (
+                Q(search_document=contract_search_query(search)) |
+                Q(contract_number__icontains=search)
+            )
+        elif search:
+            q &= (
                 Q(title__icontains=search) |
                 Q(contract_number__icontains=search) |
                 Q(customer_or_vendor_name__icontains=search)
@@ -301,63 +362,51 @@ class ContractQueryService:
         # Status filter
         status = filters.get('status')
         if status:
-            if isinstance(status, list):
-                queryset = queryset.filter(status__in=status)
+            if isinstance(status, (list, tuple)):
+                q &= Q(status__in=status)
             else:
-                queryset = queryset.filter(status=status)
+                q &= Q(status=status)
         
         # Category filter
         category = filters.get('category')
         if category:
-            if isinstance(category, list):
-                queryset = queryset.filter(category__in=category)
+            if isinstance(category, (list, tuple)):
+                q &= Q(category__in=category)
             else:
-                queryset = queryset.filter(category=category)
+                q &= Q(category=category)
         
         # BU/Team filter
         bu_team = filters.get('bu_team')
         if bu_team:
-            queryset = queryset.filter(bu_team=bu_team)
+            q &= Q(bu_team_id=bu_team)
         
         # Owner filter
         owner = filters.get('owner')
         if owner:
-            queryset = queryset.filter(owner=owner)
+            q &= Q(owner_id=owner)
         
         # Date range filter
         date_from = filters.get('date_from')
         if date_from:
-            queryset = queryset.filter(created_at__date__gte=date_from)
+            q &= Q(created_at__date__gte=date_from)
         
         date_to = filters.get('date_to')
         if date_to:
-            queryset = queryset.filter(created_at__date__lte=date_to)
+            q &= Q(created_at__date__lte=date_to)
         
-        # Tags filter
+        # Tags filter; a subquery on the link table rather than a join, so
+        # contracts with several matching tags don't need DISTINCT
         tags = filters.get('tags')
         if tags:
-            queryset = queryset.filter(tags__in=tags).distinct()
+            q &= Q(id__in=ContractTag.objects.filter(tag_id__in=tags).values('contract_id'))
         
-        return queryset
+        return q
     
     def get_contract_detail(self, contract_id):
         """Get full contract details with related data"""
         try:
-            contract = Contract.objects.select_related(
-                'owner', 'bu_team', 'contract_type', 'created_by'
-            ).prefetch_related(
-                'tags',
-                'files',
-                'versions',
-                'approvals__approver',
-                'approvals__requested_by',
-                'clauses',
-                'deviations',
-                'risks',
-                'signatures',
-                'shares__shared_with_user',
-                'shares__shared_with_department',
-            ).get(pk=contract_id)
+            # Same loading as the detail page
+            contract = Contract.objects.for_detail().get(pk=contract_id)
             
             if can_view_contract(self.user, contract):
                 return contract
@@ -373,8 +422,11 @@ class ContractQueryService:
 class ApprovalService:
     """Service for managing additional approvals"""
     
-    def __init__(self, user):
+    def __init__(self, user, request=None):
         self.user = user
+        self.is_admin = is_legal_admin(user)
+        # Audit entries join the request's buffer when one is passed
+        self.request = request
     
     def get_approvals_for_user(self, filters=None):
         """Get approvals relevant to the user"""
@@ -383,7 +435,7 @@ class ApprovalService:
         )
         
         # Base filter: user is approver or requester, or is legal admin
-        if not is_legal_admin(self.user):
+        if not self.is_admin:
             queryset = queryset.filter(
                 Q(approver=self.user) | Q(requested_by=self.user)
             )
@@ -417,6 +469,7 @@ class ApprovalService:
             contract=contract,
             action=AuditLog.Action.CREATE_APPROVAL,
             actor=self.user,
+            request=self.request,
             metadata={
                 'approval_id': approval.id,
                 'approver': str(approver),
@@ -440,6 +493,7 @@ class ApprovalService:
             contract=approval.contract,
             action=action,
             actor=self.user,
+            request=self.request,
             metadata={
                 'approval_id': approval.id,
                 'comment': comment
@@ -457,8 +511,15 @@ class AuditLogService:
     """Service for creating audit log entries"""
     
     @staticmethod
-    def log(contract, action, actor, metadata=None, request=None):
-        """Create an audit log entry"""
+    def log(contract, action, actor, metadata=None, request=None, defer=True):
+        """
+        Create an audit log entry.
+        
+        When the request carries an audit log buffer (AuditLogBufferMiddleware),
+        the entry is queued and written with the rest of the request's
+        entries once the response is ready. Pass defer=False to write it
+        straight away, e.g. inside a transaction it must commit with.
+        """
         ip_address = None
         user_agent = ''
         
@@ -466,7 +527,7 @@ class AuditLogService:
             ip_address = AuditLogService._get_client_ip(request)
             user_agent = request.META.get('HTTP_USER_AGENT', '')
         
-        return AuditLog.objects.create(
+        entry = AuditLog(
             contract=contract,
             action=action,
             actor=actor,
@@ -474,6 +535,12 @@ class AuditLogService:
             ip_address=ip_address,
             user_agent=user_agent
         )
+        buffer = getattr(request, 'audit_log_buffer', None)
+        if defer and buffer is not None:
+            buffer.append(entry)
+        else:
+            entry.save()
+        return entry
     
     @staticmethod
     def _get_client_ip(request):
@@ -493,11 +560,17 @@ class AuditLogService:
 class ContractOperationsService:
     """Service for contract CRUD operations"""
     
-    def __init__(self, user):
+    def __init__(self, user, request=None):
         self.user = user
+        # Audit entries join the request's buffer when one is passed
+        self.request = request
     
+    @transaction.atomic
     def create_contract(self, data, file=None):
-        """Create a new contract"""
+        """
+        Create a new contract with its tags, primary file, initial version and
+        audit entry, committed together.
+        """
         # Set defaults
         data['created_by'] = self.user
         if not data.get('owner'):
@@ -525,12 +598,15 @@ class ContractOperationsService:
             created_by=self.user
         )
         
-        # Log creation
+        # Log creation; written here rather than buffered so the entry
+        # commits with the contract
         AuditLogService.log(
             contract=contract,
             action=AuditLog.Action.CREATE_CONTRACT,
             actor=self.user,
-            metadata={'title': contract.title, 'status': contract.status}
+            request=self.request,
+            metadata={'title': contract.title, 'status': contract.status},
+            defer=False,
         )
         
         return contract
@@ -542,10 +618,10 @@ class ContractOperationsService:
         # Extract tags if present
         tags = data.pop('tags', None)
         
-        # Update fields
+        # Update fields; only the changed columns are written
         for field, value in data.items():
             setattr(contract, field, value)
-        contract.save()
+        contract.save(update_fields=[*data, 'updated_at'])
         
         # Update tags if provided
         if tags is not None:
@@ -557,6 +633,7 @@ class ContractOperationsService:
                 contract=contract,
                 action=AuditLog.Action.CHANGE_STATUS,
                 actor=self.user,
+                request=self.request,
                 metadata={
                     'old_status': old_status,
                     'new_status': contract.status
@@ -567,6 +644,7 @@ class ContractOperationsService:
                 contract=contract,
                 action=AuditLog.Action.UPDATE_CONTRACT,
                 actor=self.user,
+                request=self.request,
                 metadata={'updated_fields': list(data.keys())}
             )
         
@@ -576,12 +654,13 @@ class ContractOperationsService:
         """Change contract status"""
         old_status = contract.status
         contract.status = new_status
-        contract.save()
+        contract.save(update_fields=['status', 'updated_at'])
         
         AuditLogService.log(
             contract=contract,
             action=AuditLog.Action.CHANGE_STATUS,
             actor=self.user,
+            request=self.request,
             metadata={
                 'old_status': old_status,
                 'new_status': new_status,
@@ -591,6 +670,7 @@ class ContractOperationsService:
         
         return contract
     
+    @transaction.atomic
     def upload_file(self, contract, file, is_primary=False, description=''):
         """Upload a file to a contract"""
         contract_file = self._create_contract_file(
@@ -601,6 +681,7 @@ class ContractOperationsService:
             contract=contract,
             action=AuditLog.Action.ADD_FILE,
             actor=self.user,
+            request=self.request,
             metadata={
                 'filename': contract_file.original_filename,
                 'is_primary': is_primary
@@ -616,7 +697,7 @@ class ContractOperationsService:
             file=file,
             original_filename=file.name,
             file_size=file.size,
-            mime_type=getattr(file, 'content_type', ''),
+            mime_type=file.content_type,
             is_primary=is_primary,
             description=description,
             uploaded_by=self.user
@@ -624,9 +705,10 @@ class ContractOperationsService:
     
     def add_version(self, contract, label, file=None, notes=''):
         """Add a new version to a contract"""
-        # Get next version number
-        last_version = contract.versions.order_by('-version_number').first()
-        next_version = (last_version.version_number + 1) if last_version else 1
+        # Get next version number; the (contract, version_number) unique
+        # index answers MAX without reading version rows
+        last_number = contract.versions.aggregate(last=Max('version_number'))['last']
+        next_version = (last_number or 0) + 1
         
         version = ContractVersion.objects.create(
             contract=contract,
@@ -641,6 +723,7 @@ class ContractOperationsService:
             contract=contract,
             action=AuditLog.Action.ADD_VERSION,
             actor=self.user,
+            request=self.request,
             metadata={
                 'version_number': next_version,
                 'label': label
@@ -649,6 +732,7 @@ class ContractOperationsService:
         
         return version
     
+    @transaction.atomic
     def share_contract(self, contract, user=None, department=None, access_level='VIEW'):
         """Share a contract with a user or department"""
         share = ContractShare.objects.create(
@@ -663,6 +747,7 @@ class ContractOperationsService:
             contract=contract,
             action=AuditLog.Action.SHARE,
             actor=self.user,
+            request=self.request,
             metadata={
                 'shared_with_user': str(user) if user else None,
                 'shared_with_department': str(department) if department else None,
@@ -680,6 +765,13 @@ class ContractOperationsService:
 class ReportsService:
     """Service for generating reports and analytics"""
     
+    # Cached bundles are keyed by the contract and department versions and
+    # the date, so any write or a new day means a fresh key. Versions are
+    # per worker unless the cache backend is shared, so a bundle lives no
+    # longer than a version token; a write seen by another worker is picked
+    # up within that minute
+    REPORT_BUNDLE_TIMEOUT = choice_cache.VERSION_TIMEOUT
+    
     def __init__(self, user):
         self.user = user
     
@@ -688,6 +780,9 @@ class ReportsService:
         if not year:
             year = timezone.now().year
         
+        # created_at__year compiles to a BETWEEN range on the bare column,
+        # so the created_at index still bounds the scan; only the matching
+        # rows are truncated to their month
         queryset = Contract.objects.filter(
             created_at__year=year
         ).annotate(
@@ -700,11 +795,16 @@ class ReportsService:
     
     def get_contracts_by_category(self):
         """Get contract counts by category"""
-        return list(
+        rows = list(
             Contract.objects.values('category').annotate(
                 count=Count('id')
             ).order_by('-count')
         )
+        # Categories are stored as codes; labels live only in Python
+        labels = dict(Contract.Category.choices)
+        for row in rows:
+            row['label'] = labels.get(row['category'], row['category'])
+        return rows
     
     def get_contracts_by_department(self):
         """Get contract counts by department"""
@@ -720,33 +820,98 @@ class ReportsService:
     
     def get_value_by_status(self):
         """Get total contract value by status"""
-        return list(
+        rows = list(
             Contract.objects.filter(
                 value_amount__isnull=False
             ).values('status').annotate(
                 total_value=Sum('value_amount')
             ).order_by('status')
         )
+        labels = dict(Contract.Status.choices)
+        for row in rows:
+            row['label'] = labels.get(row['status'], row['status'])
+        return rows
     
-    def get_expiring_contracts_summary(self):
-        """Get summary of expiring contracts by time period"""
+    def get_report_bundle(self):
+        """
+        The category, department, value-by-status and expiring-summary
+        reports together, from one grouped scan of the contract table folded
+        in Python. Each part has the shape of its single-report method.
+        
+        The bundle is cached for up to REPORT_BUNDLE_TIMEOUT, or until a
+        contract or department is written, so repeat loads within that
+        window read one cache entry instead of scanning contracts.
+        Contract saves, deletes, bulk_create() and update() all count as
+        writes; raw SQL and Department queryset updates do not.
+        """
         today = timezone.now().date()
+        key = 'contracts:report_bundle:{}:{}:{}'.format(
+            choice_cache.get_version(choice_cache.CONTRACTS),
+            choice_cache.get_version(choice_cache.DEPARTMENTS),
+            today.isoformat(),
+        )
+        bundle = cache.get(key)
+        if bundle is None:
+            bundle = self._build_report_bundle(today)
+            cache.set(key, bundle, self.REPORT_BUNDLE_TIMEOUT)
+        return bundle
+    
+    def _build_report_bundle(self, today):
+        expiring = Q(status=Contract.Status.ACTIVE, end_date__gte=today)
+        windows = {'next_7_days': 7, 'next_30_days': 30, 'next_90_days': 90}
+        rows = Contract.objects.order_by().values('category', 'bu_team__name', 'status').annotate(
+            count=Count('id'),
+            valued=Count('value_amount'),
+            total_value=Sum('value_amount'),
+            **{
+                key: Count('id', filter=expiring & Q(end_date__lte=today + timedelta(days=days)))
+                for key, days in windows.items()
+            },
+        )
         
+        by_category = Counter()
+        by_department = Counter()
+        value_by_status = {}
+        expiring_summary = dict.fromkeys(windows, 0)
+        for row in rows:
+            by_category[row['category']] += row['count']
+            if row['bu_team__name'] is not None:
+                by_department[row['bu_team__name']] += row['count']
+            if row['valued']:
+                value_by_status[row['status']] = value_by_status.get(row['status'], 0) + row['total_value']
+            for key in windows:
+                expiring_summary[key] += row[key]
+        
+        category_labels = dict(Contract.Category.choices)
+        status_labels = dict(Contract.Status.choices)
         return {
-            'next_7_days': Contract.objects.filter(
-                status=Contract.Status.ACTIVE,
-                end_date__lte=today + timedelta(days=7),
-                end_date__gte=today
-            ).count(),
-            'next_30_days': Contract.objects.filter(
-                status=Contract.Status.ACTIVE,
-                end_date__lte=today + timedelta(days=30),
-                end_date__gte=today
-            ).count(),
-            'next_90_days': Contract.objects.filter(
-                status=Contract.Status.ACTIVE,
-                end_date__lte=today + timedelta(days=90),
-                end_date__gte=today
-            ).count(),
+            'by_category': [
+                {'category': category, 'count': count, 'label': category_labels.get(category, category)}
+                for category, count in by_category.most_common()
+            ],
+            'by_department': [
+                {'bu_team__name': name, 'count': count}
+                for name, count in by_department.most_common()
+            ],
+            'value_by_status': [
+                {'status': status, 'total_value': total, 'label': status_labels.get(status, status)}
+                for status, total in sorted(value_by_status.items())
+            ],
+            'expiring_summary': expiring_summary,
         }
+    
+    def get_expiring_contracts_summary(self):
+        """Get summary of expiring contracts by time period"""
+        today = timezone.now().date()
+        
+        # One pass over the 90-day window, bucketed with conditional counts
+        return Contract.objects.filter(
+            status=Contract.Status.ACTIVE,
+            end_date__lte=today + timedelta(days=90),
+            end_date__gte=today
+        ).aggregate(
+            next_7_days=Count('id', filter=Q(end_date__lte=today + timedelta(days=7))),
+            next_30_days=Count('id', filter=Q(end_date__lte=today + timedelta(days=30))),
+            next_90_days=Count('id'),
+        )
 
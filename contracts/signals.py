@@ -0,0 +1,75 @@
+"""
+Signal handlers for Contract Management module.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from . import choice_cache
+from .models import Contract, Department, ContractType, Tag, ClausePlaybookEntry
+from .permissions import invalidate_user_roles
+
+
+@receiver([post_save, post_delete], sender=Department)
+def invalidate_department_choices(sender, **kwargs):
+    """Drop cached department choices when a department changes"""
+    choice_cache.bump_version(choice_cache.DEPARTMENTS)
+
+
+@receiver([post_save, post_delete], sender=ContractType)
+def invalidate_contract_type_choices(sender, **kwargs):
+    """Drop cached contract type choices when a contract type changes"""
+    choice_cache.bump_version(choice_cache.CONTRACT_TYPES)
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_tag_choices(sender, **kwargs):
+    """Drop cached tag choices when a tag changes"""
+    choice_cache.bump_version(choice_cache.TAGS)
+
+
+@receiver([post_save, post_delete], sender=ClausePlaybookEntry)
+def invalidate_playbook_choices(sender, **kwargs):
+    """Drop cached playbook choices when a playbook entry changes"""
+    choice_cache.bump_version(choice_cache.PLAYBOOK)
+
+
+@receiver([post_save, post_delete], sender=Contract)
+def invalidate_contract_reports(sender, **kwargs):
+    """Drop cached contract reports when a contract changes"""
+    choice_cache.bump_version(choice_cache.CONTRACTS)
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_user_choices(sender, **kwargs):
+    """Drop cached user choices when a user changes"""
+    choice_cache.bump_version(choice_cache.USERS)
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_user_role(sender, instance, **kwargs):
+    """Drop a user's cached role when the user changes"""
+    invalidate_user_roles([instance.pk])
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def invalidate_group_member_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    """Drop cached roles when group membership changes, from either side"""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        invalidate_user_roles([instance.pk])
+    elif pk_set is not None:
+        invalidate_user_roles(pk_set)
+    else:
+        invalidate_user_roles(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver([post_save, pre_delete], sender=Group)
+def invalidate_group_roles(sender, instance, **kwargs):
+    """Drop the cached roles of a group's members when it is renamed or deleted"""
+    if kwargs.get('created'):
+        return
+    invalidate_user_roles(instance.user_set.values_list('pk', flat=True))
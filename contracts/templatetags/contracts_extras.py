@@ -2,46 +2,92 @@
 Template tags and filters for Contract Management module.
 """
 
+from functools import lru_cache
+
 from django import template
+from django.http import QueryDict
 from django.utils import timezone
+from django.utils.html import escape, format_html
 from django.utils.safestring import mark_safe
 from datetime import timedelta
 
 from contracts.permissions import (
     can_view_contract, can_edit_contract, can_delete_contract,
     can_manage_approvals, can_admin_contracts, can_create_contract,
-    is_legal_admin, is_legal_user, is_finance_viewer, get_user_role
+    is_legal_admin, is_legal_user, is_finance_viewer, get_user_role,
+    contract_permission
 )
 
 register = template.Library()
 
 
+# Choice tables are fixed per process; build them once instead of per call
+@lru_cache(maxsize=None)
+def _category_labels():
+    from contracts.models import Contract
+    return dict(Contract.Category.choices)
+
+
+@lru_cache(maxsize=None)
+def _status_choices():
+    from contracts.models import Contract
+    return tuple(Contract.Status.choices)
+
+
+@lru_cache(maxsize=None)
+def _contract_choice_names():
+    # Contract status fields are stored as small integers; the badge tables
+    # below are keyed by member name
+    from contracts.models import Contract
+    return {
+        'status': {status.value: status.name for status in Contract.Status},
+        'assignment_status': {status.value: status.name for status in Contract.AssignmentStatus},
+    }
+
+
+@lru_cache(maxsize=None)
+def _audit_action_names():
+    # AuditLog.action is stored as a small integer; the icon and colour
+    # tables below are keyed by member name
+    from contracts.models import AuditLog
+    return {action.value: action.name for action in AuditLog.Action}
+
+
 # ============================================================================
 # Permission Tags
 # ============================================================================
 
+def _check(user, contract, permission_func):
+    # Flags from prefetch_contract_permissions (set by list views) spare a
+    # query per row; otherwise ask the permission helper
+    flag = contract_permission(user, contract, permission_func.__name__)
+    if flag is None:
+        flag = permission_func(user, contract)
+    return flag
+
+
 @register.simple_tag
 def can_view(user, contract):
     """Check if user can view a contract"""
-    return can_view_contract(user, contract)
+    return _check(user, contract, can_view_contract)
 
 
 @register.simple_tag
 def can_edit(user, contract):
     """Check if user can edit a contract"""
-    return can_edit_contract(user, contract)
+    return _check(user, contract, can_edit_contract)
 
 
 @register.simple_tag
 def can_delete(user, contract):
     """Check if user can delete a contract"""
-    return can_delete_contract(user, contract)
+    return _check(user, contract, can_delete_contract)
 
 
 @register.simple_tag
 def can_manage_approval(user, contract):
     """Check if user can manage approvals for a contract"""
-    return can_manage_approvals(user, contract)
+    return _check(user, contract, can_manage_approvals)
 
 
 @register.simple_tag
@@ -66,58 +112,77 @@ def user_role(user):
 # Status Tags
 # ============================================================================
 
+# Badge markup for each known value is built once at import; unknown values
+# fall back to an escaped secondary badge
+def _badge_html(badge_classes, label=lambda value: value):
+    return {
+        value: mark_safe(f'<span class="badge {badge_class}">{label(value)}</span>')
+        for value, badge_class in badge_classes.items()
+    }
+
+
+def _fallback_badge(label):
+    return format_html('<span class="badge bg-secondary">{}</span>', label)
+
+
+def _assignment_label(status):
+    return str(status).replace('_', ' ').title()
+
+
+_STATUS_BADGES = _badge_html({
+    'DRAFT': 'bg-secondary',
+    'PENDING': 'bg-warning text-dark',
+    'ACTIVE': 'bg-success',
+    'EXPIRED': 'bg-danger',
+    'TERMINATED': 'bg-dark',
+    'ARCHIVED': 'bg-info',
+})
+
+_APPROVAL_STATUS_BADGES = _badge_html({
+    'PENDING': 'bg-warning text-dark',
+    'APPROVED': 'bg-success',
+    'REJECTED': 'bg-danger',
+    'CANCELLED': 'bg-secondary',
+})
+
+_RISK_BADGES = _badge_html({
+    'LOW': 'bg-success',
+    'MEDIUM': 'bg-warning text-dark',
+    'HIGH': 'bg-danger',
+    'CRITICAL': 'bg-dark',
+})
+
+_ASSIGNMENT_BADGES = _badge_html({
+    'NOT_ASSIGNED': 'bg-secondary',
+    'IN_PROGRESS': 'bg-primary',
+    'COMPLETED': 'bg-success',
+}, label=_assignment_label)
+
+
 @register.filter
 def status_badge(status):
     """Return Bootstrap badge class for contract status"""
-    badges = {
-        'DRAFT': 'bg-secondary',
-        'PENDING': 'bg-warning text-dark',
-        'ACTIVE': 'bg-success',
-        'EXPIRED': 'bg-danger',
-        'TERMINATED': 'bg-dark',
-        'ARCHIVED': 'bg-info',
-    }
-    badge_class = badges.get(status, 'bg-secondary')
-    return mark_safe(f'<span class="badge {badge_class}">{status}</span>')
+    status = _contract_choice_names()['status'].get(status, status)
+    return _STATUS_BADGES.get(status) or _fallback_badge(status)
 
 
 @register.filter
 def approval_status_badge(status):
     """Return Bootstrap badge class for approval status"""
-    badges = {
-        'PENDING': 'bg-warning text-dark',
-        'APPROVED': 'bg-success',
-        'REJECTED': 'bg-danger',
-        'CANCELLED': 'bg-secondary',
-    }
-    badge_class = badges.get(status, 'bg-secondary')
-    return mark_safe(f'<span class="badge {badge_class}">{status}</span>')
+    return _APPROVAL_STATUS_BADGES.get(status) or _fallback_badge(status)
 
 
 @register.filter
 def risk_badge(risk_level):
     """Return Bootstrap badge class for risk level"""
-    badges = {
-        'LOW': 'bg-success',
-        'MEDIUM': 'bg-warning text-dark',
-        'HIGH': 'bg-danger',
-        'CRITICAL': 'bg-dark',
-    }
-    badge_class = badges.get(risk_level, 'bg-secondary')
-    return mark_safe(f'<span class="badge {badge_class}">{risk_level}</span>')
+    return _RISK_BADGES.get(risk_level) or _fallback_badge(risk_level)
 
 
 @register.filter
 def assignment_badge(status):
     """Return Bootstrap badge class for assignment status"""
-    badges = {
-        'NOT_ASSIGNED': 'bg-secondary',
-        'IN_PROGRESS': 'bg-primary',
-        'COMPLETED': 'bg-success',
-    }
-    badge_class = badges.get(status, 'bg-secondary')
-    label = status.replace('_', ' ').title()
-    return mark_safe(f'<span class="badge {badge_class}">{label}</span>')
+    status = _contract_choice_names()['assignment_status'].get(status, status)
+    return _ASSIGNMENT_BADGES.get(status) or _fallback_badge(_assignment_label(status))
 
 
 # ============================================================================
@@ -125,11 +190,15 @@ def assignment_badge(status):
 # ============================================================================
 
 @register.filter
-def days_until(date):
-    """Calculate days until a date"""
+def days_until(date, today=None):
+    """
+    Calculate days until a date. Templates pass the `today` context value
+    (contracts.context_processors.today) so rows share one clock read.
+    """
     if not date:
         return None
-    today = timezone.now().date()
+    if today is None:
+        today = timezone.now().date()
     delta = date - today
     return delta.days
 
@@ -145,12 +214,12 @@ def is_expiring_soon(date, days=30):
 
 
 @register.filter
-def expiry_class(date):
+def expiry_class(date, today=None):
     """Return CSS class based on how soon a date is"""
     if not date:
         return ''
     
-    days = days_until(date)
+    days = days_until(date, today)
     if days is None:
         return ''
     
@@ -168,24 +237,32 @@ def expiry_class(date):
 # Formatting Tags
 # ============================================================================
 
+_CURRENCY_SYMBOLS = {
+    'INR': '₹',
+    'USD': '$',
+    'EUR': '€',
+    'GBP': '£',
+    'AED': 'د.إ',
+    'SGD': 'S$',
+}
+
+
+@lru_cache(maxsize=16)
+def _currency_formatter(currency):
+    # One format string per currency, with its symbol already in place
+    symbol = _CURRENCY_SYMBOLS.get(currency, f'{currency} ').replace('{', '{{').replace('}', '}}')
+    return (symbol + '{:,.2f}').format
+
+
 @register.filter
 def currency_format(value, currency='INR'):
     """Format a decimal value as currency"""
     if value is None:
         return '-'
-    
-    symbols = {
-        'INR': '₹',
-        'USD': '$',
-        'EUR': '€',
-        'GBP': '£',
-        'AED': 'د.إ',
-        'SGD': 'S$',
-    }
-    
-    symbol = symbols.get(currency, currency + ' ')
-    formatted = f"{value:,.2f}"
-    return f"{symbol}{formatted}"
+    return _currency_formatter(currency)(value)
+
+
+_FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
 
 
 @register.filter
@@ -194,71 +271,75 @@ def file_size_format(size_bytes):
     if not size_bytes:
         return '0 B'
     
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if abs(size_bytes) < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    
-    return f"{size_bytes:.1f} TB"
+    # Each unit is 2**10 of the one before, so the bit length picks the unit
+    index = min(max(int(abs(size_bytes)).bit_length() - 1, 0) // 10, len(_FILE_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * index)):.1f} {_FILE_SIZE_UNITS[index]}"
 
 
-@register.filter
+@register.filter(is_safe=True)
 def truncate_middle(value, length=50):
     """Truncate a string in the middle if too long"""
-    if not value or len(value) <= length:
+    if not value:
+        return value
+    size = len(value)
+    if size <= length:
         return value
     
+    # Slice the tail from an absolute offset; value[-0:] would be the whole string
     half = (length - 3) // 2
-    return f"{value[:half]}...{value[-half:]}"
+    return f"{value[:half]}...{value[size - half:]}"
 
 
 # ============================================================================
 # Audit Log Tags
 # ============================================================================
 
+_AUDIT_ACTION_ICONS = {
+    'CREATE_CONTRACT': 'bi-file-plus',
+    'UPDATE_CONTRACT': 'bi-pencil',
+    'DELETE_CONTRACT': 'bi-trash',
+    'CHANGE_STATUS': 'bi-arrow-repeat',
+    'ADD_FILE': 'bi-paperclip',
+    'REMOVE_FILE': 'bi-x-circle',
+    'ADD_VERSION': 'bi-layers',
+    'CREATE_APPROVAL': 'bi-person-plus',
+    'APPROVE': 'bi-check-circle',
+    'REJECT': 'bi-x-circle',
+    'CANCEL_APPROVAL': 'bi-slash-circle',
+    'SHARE': 'bi-share',
+    'UNSHARE': 'bi-share-fill',
+    'ADD_CLAUSE': 'bi-list-check',
+    'UPDATE_CLAUSE': 'bi-pencil-square',
+    'ADD_DEVIATION': 'bi-exclamation-triangle',
+    'ADD_RISK': 'bi-shield-exclamation',
+    'ADD_SIGNATURE': 'bi-pen',
+    'SIGN': 'bi-pen-fill',
+    'VIEW': 'bi-eye',
+    'DOWNLOAD': 'bi-download',
+}
+
+_AUDIT_ACTION_COLORS = {
+    'CREATE_CONTRACT': 'text-success',
+    'UPDATE_CONTRACT': 'text-primary',
+    'DELETE_CONTRACT': 'text-danger',
+    'CHANGE_STATUS': 'text-info',
+    'APPROVE': 'text-success',
+    'REJECT': 'text-danger',
+    'ADD_RISK': 'text-warning',
+    'ADD_DEVIATION': 'text-warning',
+}
+
+
 @register.filter
 def audit_action_icon(action):
     """Return Bootstrap icon class for audit action"""
-    icons = {
-        'CREATE_CONTRACT': 'bi-file-plus',
-        'UPDATE_CONTRACT': 'bi-pencil',
-        'DELETE_CONTRACT': 'bi-trash',
-        'CHANGE_STATUS': 'bi-arrow-repeat',
-        'ADD_FILE': 'bi-paperclip',
-        'REMOVE_FILE': 'bi-x-circle',
-        'ADD_VERSION': 'bi-layers',
-        'CREATE_APPROVAL': 'bi-person-plus',
-        'APPROVE': 'bi-check-circle',
-        'REJECT': 'bi-x-circle',
-        'CANCEL_APPROVAL': 'bi-slash-circle',
-        'SHARE': 'bi-share',
-        'UNSHARE': 'bi-share-fill',
-        'ADD_CLAUSE': 'bi-list-check',
-        'UPDATE_CLAUSE': 'bi-pencil-square',
-        'ADD_DEVIATION': 'bi-exclamation-triangle',
-        'ADD_RISK': 'bi-shield-exclamation',
-        'ADD_SIGNATURE': 'bi-pen',
-        'SIGN': 'bi-pen-fill',
-        'VIEW': 'bi-eye',
-        'DOWNLOAD': 'bi-download',
-    }
-    return icons.get(action, 'bi-circle')
+    return _AUDIT_ACTION_ICONS.get(_audit_action_names().get(action), 'bi-circle')
 
 
 @register.filter
 def audit_action_color(action):
     """Return color class for audit action"""
-    colors = {
-        'CREATE_CONTRACT': 'text-success',
-        'UPDATE_CONTRACT': 'text-primary',
-        'DELETE_CONTRACT': 'text-danger',
-        'CHANGE_STATUS': 'text-info',
-        'APPROVE': 'text-success',
-        'REJECT': 'text-danger',
-        'ADD_RISK': 'text-warning',
-        'ADD_DEVIATION': 'text-warning',
-    }
-    return colors.get(action, 'text-muted')
+    return _AUDIT_ACTION_COLORS.get(_audit_action_names().get(action), 'text-muted')
 
 
 # ============================================================================
@@ -282,11 +363,23 @@ def query_string(context, **kwargs):
     if not request:
         return ''
     
-    params = request.GET.copy()
+    if not kwargs:
+        # Links that keep the current params as-is share one encoding
+        base = getattr(request, '_query_string_base', None)
+        if base is None:
+            base = request._query_string_base = request.GET.urlencode()
+        return base
+    
+    # Build the result directly rather than deep-copying request.GET per link;
+    # overridden keys keep their position, new ones go last
+    params = QueryDict(mutable=True)
+    for key, values in request.GET.lists():
+        if key not in kwargs:
+            params.setlist(key, values)
+        elif kwargs[key] is not None:
+            params[key] = kwargs[key]
     for key, value in kwargs.items():
-        if value is None:
-            params.pop(key, None)
-        else:
+        if value is not None and key not in params:
             params[key] = value
     
     return params.urlencode()
@@ -299,9 +392,8 @@ def query_string(context, **kwargs):
 @register.filter
 def category_display(category):
     """Return display name for category"""
-    from contracts.models import Contract
     try:
-        return dict(Contract.Category.choices).get(category, category)
+        return _category_labels().get(category, category)
     except Exception:
         return category
 
@@ -329,28 +421,62 @@ def sign_type_display(sign_type):
     return types.get(sign_type, sign_type)
 
 
+# ============================================================================
+# Form Tags
+# ============================================================================
+
+@lru_cache(maxsize=8)
+def _escaped_choices(choices):
+    # Keyed by the choices tuple, which choice_cache reuses until the
+    # table changes, so names are escaped once per version
+    return tuple((escape(value), str(value), escape(label)) for value, label in choices)
+
+
+@register.simple_tag
+def tag_checkbox_grid(bound_field, empty_text=''):
+    """
+    Render a multiple-choice field as inline Bootstrap checkboxes in one
+    pass, instead of rendering a widget template per option
+    """
+    choices = _escaped_choices(tuple(bound_field.field.choices))
+    if not choices:
+        return mark_safe(f'<p class="text-muted mb-0 small">{escape(empty_text)}</p>') if empty_text else ''
+    
+    name = escape(bound_field.html_name)
+    auto_id = escape(bound_field.auto_id)
+    selected = {str(value) for value in bound_field.value() or ()}
+    return mark_safe(''.join(
+        f'<div class="form-check form-check-inline">'
+        f'<input type="checkbox" name="{name}" value="{value}" class="form-check-input" id="{auto_id}_{i}"'
+        f'{" checked" if raw in selected else ""}>'
+        f'<label class="form-check-label" for="{auto_id}_{i}">{label}</label>'
+        f'</div>'
+        for i, (value, raw, label) in enumerate(choices)
+    ))
+
+
 # ============================================================================
 # Inclusion Tags
 # ============================================================================
 
-@register.inclusion_tag('contracts/includes/contract_card.html')
-def contract_card(contract, user):
+@register.inclusion_tag('contracts/includes/contract_card.html', takes_context=True)
+def contract_card(context, contract, user):
     """Render a contract card"""
     return {
         'contract': contract,
         'user': user,
-        'can_edit': can_edit_contract(user, contract),
-        'can_delete': can_delete_contract(user, contract),
+        'today': context.get('today'),
+        'can_edit': _check(user, contract, can_edit_contract),
+        'can_delete': _check(user, contract, can_delete_contract),
     }
 
 
 @register.inclusion_tag('contracts/includes/status_select.html')
 def status_select(current_status, field_name='status'):
     """Render a status select dropdown"""
-    from contracts.models import Contract
     return {
         'current_status': current_status,
         'field_name': field_name,
-        'choices': Contract.Status.choices,
+        'choices': _status_choices(),
     }
 
@@ -46,7 +46,8 @@ from .permissions import (
     can_manage_approvals, can_admin_contracts, can_create_contract,
     can_upload_files, can_add_version, can_change_status,
     can_approve_request, can_share_contract, get_user_permissions_context,
-    is_legal_admin, admin_required, legal_user_required
+    is_legal_admin, admin_required, legal_user_required,
+    prefetch_contract_permissions
 )
 
 
@@ -127,6 +128,8 @@ class ContractListView(LoginRequiredMixin, ListView):
             'can_create': can_create_contract(self.request.user),
             **get_user_permissions_context(self.request.user),
         })
+        # Per-row actions read their flags from the page's contracts
+        prefetch_contract_permissions(self.request.user, context['contracts'])
         
         return context
 
@@ -142,17 +145,7 @@ class ContractDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'contract'
     
     def get_object(self, queryset=None):
-        contract = get_object_or_404(
-            Contract.objects.select_related(
-                'owner', 'bu_team', 'contract_type', 'created_by'
-            ).prefetch_related(
-                'tags', 'files', 'versions', 'approvals__approver',
-                'approvals__requested_by', 'clauses', 'deviations',
-                'risks', 'signatures', 'shares__shared_with_user',
-                'shares__shared_with_department'
-            ),
-            pk=self.kwargs['pk']
-        )
+        contract = get_object_or_404(Contract.objects.for_detail(), pk=self.kwargs['pk'])
         
         if not can_view_contract(self.request.user, contract):
             messages.error(self.request, "You don't have permission to view this contract.")
@@ -180,15 +173,12 @@ class ContractDetailView(LoginRequiredMixin, DetailView):
         contract = self.object
         
         # Get primary file for viewer
-        primary_file = contract.files.filter(is_primary=True).first()
-        
-        # Get audit logs for this contract
-        audit_logs = contract.audit_logs.select_related('actor').order_by('-created_at')[:20]
+        primary_file = contract.primary_file
         
         # Forms for modals
         context.update({
             'primary_file': primary_file,
-            'audit_logs': audit_logs,
+            'audit_logs': contract.recent_audit_logs,
             'file_upload_form': ContractFileUploadForm(),
             'version_form': ContractVersionForm(),
             'approval_form': AdditionalApprovalRequestForm(),
@@ -283,9 +273,12 @@ class ContractCreateWizardView(LoginRequiredMixin, View):
         if step == 'value':
             # Store data directly
             value_amount = request.POST.get('value_amount', '')
+            currency = request.POST.get('currency', '')
+            if currency not in Contract.Currency.values:
+                currency = Contract.Currency.INR
             wizard_data[step] = {
                 'value_amount': value_amount if value_amount else None,
-                'currency': request.POST.get('currency', 'INR'),
+                'currency': currency,
                 'opportunity_id': request.POST.get('opportunity_id', ''),
             }
             request.session['contract_wizard'] = wizard_data
@@ -389,12 +382,12 @@ class ContractCreateWizardView(LoginRequiredMixin, View):
             'status': Contract.Status.DRAFT if as_draft else Contract.Status.PENDING,
             'org_entity': wizard_data.get('basic', {}).get('org_entity', ''),
             'region_country': wizard_data.get('basic', {}).get('region_country', ''),
-            'bu_team': wizard_data.get('basic', {}).get('bu_team'),
-            'category': wizard_data.get('basic', {}).get('category', 'OTHER'),
+            'bu_team_id': wizard_data.get('basic', {}).get('bu_team') or None,
+            'category': wizard_data.get('basic', {}).get('category', Contract.Category.OTHER),
             'sub_category': wizard_data.get('basic', {}).get('sub_category', ''),
             'customer_or_vendor_name': wizard_data.get('party', {}).get('customer_or_vendor_name', ''),
             'customer_or_vendor_address': wizard_data.get('party', {}).get('customer_or_vendor_address', ''),
-            'contract_type': wizard_data.get('party', {}).get('contract_type'),
+            'contract_type_id': wizard_data.get('party', {}).get('contract_type') or None,
             'effective_date': self._parse_date(wizard_data.get('dates', {}).get('effective_date')),
             'end_date': self._parse_date(wizard_data.get('dates', {}).get('end_date')),
             'auto_renewal': wizard_data.get('dates', {}).get('auto_renewal', False),
@@ -411,7 +404,7 @@ class ContractCreateWizardView(LoginRequiredMixin, View):
         file_data = request.session.get('contract_wizard_file')
         file_name = request.session.get('contract_wizard_file_name')
         
-        ops_service = ContractOperationsService(request.user)
+        ops_service = ContractOperationsService(request.user, request)
         
         # Create a file-like object if we have file data
         uploaded_file = None
@@ -441,6 +434,7 @@ class ContractCreateWizardView(LoginRequiredMixin, View):
 class ContractUpdateView(LoginRequiredMixin, UpdateView):
     """Edit an existing contract"""
     model = Contract
+    queryset = Contract.objects.for_permission_check()
     form_class = ContractForm
     template_name = 'contracts/contract_edit.html'
     
@@ -451,6 +445,13 @@ class ContractUpdateView(LoginRequiredMixin, UpdateView):
             return redirect('contracts:detail', pk=self.object.pk)
         return super().dispatch(request, *args, **kwargs)
     
+    def get_object(self, queryset=None):
+        # dispatch already loaded the contract for the permission check;
+        # UpdateView's get/post ask for it again
+        if getattr(self, 'object', None) is not None:
+            return self.object
+        return super().get_object(queryset)
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context.update({
@@ -460,7 +461,7 @@ class ContractUpdateView(LoginRequiredMixin, UpdateView):
     
     def form_valid(self, form):
         # Use service for update to trigger audit logging
-        ops_service = ContractOperationsService(self.request.user)
+        ops_service = ContractOperationsService(self.request.user, self.request)
         ops_service.update_contract(self.object, form.cleaned_data)
         
         messages.success(self.request, "Contract updated successfully.")
@@ -475,7 +476,7 @@ class ContractFileUploadView(LoginRequiredMixin, View):
     """Handle file uploads for a contract"""
     
     def post(self, request, pk):
-        contract = get_object_or_404(Contract, pk=pk)
+        contract = get_object_or_404(Contract.objects.for_permission_check(), pk=pk)
         
         if not can_upload_files(request.user, contract):
             messages.error(request, "You don't have permission to upload files.")
@@ -484,7 +485,7 @@ class ContractFileUploadView(LoginRequiredMixin, View):
         form = ContractFileUploadForm(request.POST, request.FILES)
         
         if form.is_valid():
-            ops_service = ContractOperationsService(request.user)
+            ops_service = ContractOperationsService(request.user, request)
             ops_service.upload_file(
                 contract,
                 request.FILES['file'],
@@ -502,7 +503,7 @@ class ContractFileDownloadView(LoginRequiredMixin, View):
     """Download a contract file"""
     
     def get(self, request, pk, file_id):
-        contract = get_object_or_404(Contract, pk=pk)
+        contract = get_object_or_404(Contract.objects.for_permission_check(), pk=pk)
         
         if not can_view_contract(request.user, contract):
             return HttpResponseForbidden("You don't have permission to access this file.")
@@ -529,7 +530,7 @@ class ContractVersionCreateView(LoginRequiredMixin, View):
     """Add a new version to a contract"""
     
     def post(self, request, pk):
-        contract = get_object_or_404(Contract, pk=pk)
+        contract = get_object_or_404(Contract.objects.for_permission_check(), pk=pk)
         
         if not can_add_version(request.user, contract):
             messages.error(request, "You don't have permission to add versions.")
@@ -538,7 +539,7 @@ class ContractVersionCreateView(LoginRequiredMixin, View):
         form = ContractVersionForm(request.POST, request.FILES)
         
         if form.is_valid():
-            ops_service = ContractOperationsService(request.user)
+            ops_service = ContractOperationsService(request.user, request)
             ops_service.add_version(
                 contract,
                 label=form.cleaned_data['label'],
@@ -560,7 +561,7 @@ class ContractStatusChangeView(LoginRequiredMixin, View):
     """Change contract status"""
     
     def post(self, request, pk):
-        contract = get_object_or_404(Contract, pk=pk)
+        contract = get_object_or_404(Contract.objects.for_permission_check(), pk=pk)
         
         if not can_change_status(request.user, contract):
             messages.error(request, "You don't have permission to change the status.")
@@ -569,13 +570,13 @@ class ContractStatusChangeView(LoginRequiredMixin, View):
         form = StatusChangeForm(request.POST)
         
         if form.is_valid():
-            ops_service = ContractOperationsService(request.user)
+            ops_service = ContractOperationsService(request.user, request)
             ops_service.change_status(
                 contract,
                 form.cleaned_data['new_status'],
                 form.cleaned_data.get('reason', '')
             )
-            messages.success(request, f"Status changed to {form.cleaned_data['new_status']}.")
+            messages.success(request, f"Status changed to {contract.get_status_display()}.")
         else:
             messages.error(request, "Error changing status.")
         
@@ -590,7 +591,7 @@ class ContractShareCreateView(LoginRequiredMixin, View):
     """Share a contract with a user or department"""
     
     def post(self, request, pk):
-        contract = get_object_or_404(Contract, pk=pk)
+        contract = get_object_or_404(Contract.objects.for_permission_check(), pk=pk)
         
         if not can_share_contract(request.user, contract):
             messages.error(request, "You don't have permission to share this contract.")
@@ -599,7 +600,7 @@ class ContractShareCreateView(LoginRequiredMixin, View):
         form = ContractShareForm(request.POST)
         
         if form.is_valid():
-            ops_service = ContractOperationsService(request.user)
+            ops_service = ContractOperationsService(request.user, request)
             ops_service.share_contract(
                 contract,
                 user=form.cleaned_data.get('shared_with_user'),
@@ -682,7 +683,7 @@ class ApprovalDetailView(LoginRequiredMixin, View):
         form = ApprovalDecisionForm(request.POST)
         
         if form.is_valid():
-            approval_service = ApprovalService(request.user)
+            approval_service = ApprovalService(request.user, request)
             approval_service.process_decision(
                 approval,
                 form.cleaned_data['decision'],
@@ -709,7 +710,7 @@ class ApprovalRequestCreateView(LoginRequiredMixin, View):
     """Create a new approval request for a contract"""
     
     def post(self, request, pk):
-        contract = get_object_or_404(Contract, pk=pk)
+        contract = get_object_or_404(Contract.objects.for_permission_check(), pk=pk)
         
         if not can_manage_approvals(request.user, contract):
             messages.error(request, "You don't have permission to request approvals.")
@@ -718,7 +719,7 @@ class ApprovalRequestCreateView(LoginRequiredMixin, View):
         form = AdditionalApprovalRequestForm(request.POST)
         
         if form.is_valid():
-            approval_service = ApprovalService(request.user)
+            approval_service = ApprovalService(request.user, request)
             approval_service.create_approval_request(
                 contract,
                 form.cleaned_data['approver'],
@@ -740,7 +741,7 @@ class ClauseCreateView(LoginRequiredMixin, View):
     """Add a clause to a contract"""
     
     def post(self, request, pk):
-        contract = get_object_or_404(Contract, pk=pk)
+        contract = get_object_or_404(Contract.objects.for_permission_check(), pk=pk)
         
         if not can_edit_contract(request.user, contract):
             messages.error(request, "You don't have permission to add clauses.")
@@ -755,7 +756,7 @@ class ClauseCreateView(LoginRequiredMixin, View):
                 text=form.cleaned_data['text'],
                 risk_level=form.cleaned_data['risk_level'],
                 is_from_playbook=form.cleaned_data.get('use_playbook', False),
-                playbook_entry=form.cleaned_data.get('playbook_entry'),
+                playbook_entry_id=form.cleaned_data.get('playbook_entry') or None,
                 created_by=request.user
             )
             
@@ -781,7 +782,7 @@ class DeviationCreateView(LoginRequiredMixin, View):
     """Add a deviation to a contract"""
     
     def post(self, request, pk):
-        contract = get_object_or_404(Contract, pk=pk)
+        contract = get_object_or_404(Contract.objects.for_permission_check(), pk=pk)
         
         if not can_edit_contract(request.user, contract):
             messages.error(request, "You don't have permission to add deviations.")
@@ -821,7 +822,7 @@ class RiskItemCreateView(LoginRequiredMixin, View):
     """Add a risk item to a contract"""
     
     def post(self, request, pk):
-        contract = get_object_or_404(Contract, pk=pk)
+        contract = get_object_or_404(Contract.objects.for_permission_check(), pk=pk)
         
         if not can_edit_contract(request.user, contract):
             messages.error(request, "You don't have permission to add risk items.")
@@ -860,7 +861,7 @@ class SignatureRecordCreateView(LoginRequiredMixin, View):
     """Add a signature record to a contract"""
     
     def post(self, request, pk):
-        contract = get_object_or_404(Contract, pk=pk)
+        contract = get_object_or_404(Contract.objects.for_permission_check(), pk=pk)
         
         if not can_edit_contract(request.user, contract):
             messages.error(request, "You don't have permission to add signature records.")
@@ -132,8 +132,16 @@ class PulseAssistant {
 How can I help you today?`);
     }
 
+    formatContent(content) {
+        // Convert markdown-style bold to HTML
+        return content
+            .replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>')
+            .replace(/\n/g, '<br>');
+    }
+
     addMessage(role, content) {
-        this.messages.push({ role, content });
+        const message = { role, content };
+        this.messages.push(message);
         
         const messageDiv = document.createElement('div');
         messageDiv.className = `chat-message ${role}`;
@@ -142,18 +150,22 @@ How can I help you today?`);
             ? '<div class="message-avatar"><i class="bi bi-stars"></i></div>'
             : '';
         
-        // Convert markdown-style bold to HTML
-        const formattedContent = content
-            .replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>')
-            .replace(/\n/g, '<br>');
-        
         messageDiv.innerHTML = `
             ${avatar}
-            <div class="message-content">${formattedContent}</div>
+            <div class="message-content">${this.formatContent(content)}</div>
         `;
         
         this.messages_container.appendChild(messageDiv);
         this.scrollToBottom();
+        
+        return {
+            // Replace the text of a message that is still being streamed
+            update: (text) => {
+                message.content = text;
+                messageDiv.querySelector('.message-content').innerHTML = this.formatContent(text);
+                this.scrollToBottom();
+            }
+        };
     }
 
     addLoadingMessage() {
@@ -188,6 +200,9 @@ How can I help you today?`);
         // Hide quick actions after first message
         this.quickActions.style.display = 'none';
 
+        // Earlier turns only: skip the greeting and the message being sent
+        const history = this.messages.slice(1).slice(-6);
+
         // Add user message
         this.addMessage('user', message);
         this.input.value = '';
@@ -205,18 +220,25 @@ How can I help you today?`);
                 },
                 body: JSON.stringify({
                     message: message,
-                    history: this.messages.slice(-10) // Send last 10 messages for context
+                    history: history,
+                    stream: true
                 })
             });
 
-            const data = await response.json();
+            const contentType = response.headers.get('Content-Type') || '';
             
-            this.removeLoadingMessage();
-            
-            if (data.success) {
-                this.addMessage('assistant', data.response);
+            if (contentType.includes('application/x-ndjson')) {
+                await this.readStream(response);
             } else {
-                this.addMessage('assistant', 'Sorry, I encountered an error. Please try again.');
+                const data = await response.json();
+                
+                this.removeLoadingMessage();
+                
+                if (data.success) {
+                    this.addMessage('assistant', data.response);
+                } else {
+                    this.addMessage('assistant', 'Sorry, I encountered an error. Please try again.');
+                }
             }
         } catch (error) {
             console.error('Chat error:', error);
@@ -227,6 +249,54 @@ How can I help you today?`);
         this.isLoading = false;
     }
 
+    async readStream(response) {
+        // Render the reply chunk by chunk as NDJSON lines arrive
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let text = '';
+        let message = null;
+
+        const handleLine = (line) => {
+            if (!line.trim()) return;
+            const data = JSON.parse(line);
+            
+            if (data.chunk) {
+                text += data.chunk;
+                if (!message) {
+                    this.removeLoadingMessage();
+                    message = this.addMessage('assistant', text);
+                } else {
+                    message.update(text);
+                }
+            } else if (data.success === false) {
+                this.removeLoadingMessage();
+                text += (text ? '\n\n' : '') + (data.error || 'Sorry, I encountered an error. Please try again.');
+                if (message) {
+                    message.update(text);
+                } else {
+                    message = this.addMessage('assistant', text);
+                }
+            }
+        };
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.forEach(handleLine);
+        }
+        handleLine(buffer + decoder.decode());
+
+        this.removeLoadingMessage();
+        if (!message) {
+            this.addMessage('assistant', 'Sorry, I encountered an error. Please try again.');
+        }
+    }
+
     getCSRFToken() {
         const cookie = document.cookie
             .split('; ')